@@ -13,7 +13,7 @@ from config.logging_config import configure_logging
 from config.settings import get_settings
 from providers.exceptions import ProviderError
 
-from .dependencies import cleanup_provider
+from .dependencies import ProviderFactory, cleanup_provider
 from .routes import router
 
 # Opt-in to future behavior for python-telegram-bot
@@ -45,6 +45,13 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     logger.info("Starting Claude Code Proxy...")
 
+    # Build the default provider up front so its HTTP client is ready before
+    # the first request; a missing key is reported again on first use.
+    try:
+        ProviderFactory(settings).get()
+    except Exception as e:
+        logger.warning(f"Default provider not initialized at startup: {e}")
+
     # Initialize messaging platform if configured
     messaging_platform = None
     message_handler = None
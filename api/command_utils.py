@@ -1,7 +1,31 @@
 """Command parsing utilities for API optimizations."""
 
+import re
 import shlex
 
+# Words as shlex.split(posix=False) sees them when no quotes are involved:
+# runs of anything other than shlex's whitespace set.
+_WORD_RE = re.compile(r"[^ \t\r\n]+")
+# Backtick or $( substitution anywhere in the command.
+_INJECTION_RE = re.compile(r"`|\$\(")
+
+_TWO_WORD_COMMANDS = frozenset(
+    {"git", "npm", "docker", "kubectl", "cargo", "go", "pip", "yarn"}
+)
+# Commands that only list paths vs. ones that read file contents.
+_LISTING_COMMANDS = frozenset(
+    {"ls", "dir", "find", "tree", "pwd", "cd", "mkdir", "rmdir", "rm"}
+)
+_READING_COMMANDS = frozenset({"cat", "head", "tail", "less", "more", "bat", "type"})
+_GREP_FLAGS_WITH_ARGS = frozenset({"-e", "-f", "-m", "-A", "-B", "-C"})
+
+
+def _split_command(command: str) -> list[str]:
+    """Split a command into words, using shlex only when quotes are present."""
+    if "'" in command or '"' in command:
+        return shlex.split(command, posix=False)
+    return _WORD_RE.findall(command)
+
 
 def extract_command_prefix(command: str) -> str:
     """Extract the command prefix for fast prefix detection.
@@ -14,11 +38,11 @@ def extract_command_prefix(command: str) -> str:
         Command prefix (e.g., "git", "git commit", "npm install")
         or "none" if no valid command found
     """
-    if "`" in command or "$(" in command:
+    if _INJECTION_RE.search(command):
         return "command_injection_detected"
 
     try:
-        parts = shlex.split(command, posix=False)
+        parts = _split_command(command)
         if not parts:
             return "none"
 
@@ -39,18 +63,7 @@ def extract_command_prefix(command: str) -> str:
             return "none"
 
         first_word = cmd_parts[0]
-        two_word_commands = {
-            "git",
-            "npm",
-            "docker",
-            "kubectl",
-            "cargo",
-            "go",
-            "pip",
-            "yarn",
-        }
-
-        if first_word in two_word_commands and len(cmd_parts) > 1:
+        if first_word in _TWO_WORD_COMMANDS and len(cmd_parts) > 1:
             second_word = cmd_parts[1]
             if not second_word.startswith("-"):
                 return f"{first_word} {second_word}"
@@ -71,31 +84,17 @@ def extract_filepaths_from_command(command: str, output: str) -> str:
     Returns:
         Filepath extraction result in <filepaths> format
     """
-    listing_commands = {
-        "ls",
-        "dir",
-        "find",
-        "tree",
-        "pwd",
-        "cd",
-        "mkdir",
-        "rmdir",
-        "rm",
-    }
-
-    reading_commands = {"cat", "head", "tail", "less", "more", "bat", "type"}
-
     try:
-        parts = shlex.split(command, posix=False)
+        parts = _split_command(command)
         if not parts:
             return "<filepaths>\n</filepaths>"
 
         base_cmd = parts[0].split("/")[-1].split("\\")[-1].lower()
 
-        if base_cmd in listing_commands:
+        if base_cmd in _LISTING_COMMANDS:
             return "<filepaths>\n</filepaths>"
 
-        if base_cmd in reading_commands:
+        if base_cmd in _READING_COMMANDS:
             filepaths = []
             for part in parts[1:]:
                 if part.startswith("-"):
@@ -108,7 +107,6 @@ def extract_filepaths_from_command(command: str, output: str) -> str:
             return "<filepaths>\n</filepaths>"
 
         if base_cmd == "grep":
-            flags_with_args = {"-e", "-f", "-m", "-A", "-B", "-C"}
             pattern_provided_via_flag = False
             positional: list[str] = []
 
@@ -119,7 +117,7 @@ def extract_filepaths_from_command(command: str, output: str) -> str:
                     continue
 
                 if part.startswith("-"):
-                    if part in flags_with_args:
+                    if part in _GREP_FLAGS_WITH_ARGS:
                         if part in {"-e", "-f"}:
                             pattern_provided_via_flag = True
                         skip_next = True
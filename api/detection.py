@@ -4,10 +4,36 @@ Detects quota checks, title generation, prefix detection, suggestion mode,
 and filepath extraction requests to enable fast-path responses.
 """
 
+import re
+
 from utils.text import extract_text_from_content
 
 from .models.anthropic import MessagesRequest
 
+# Case-insensitive searches without lowercasing a copy of the message text.
+_QUOTA_RE = re.compile(r"quota", re.IGNORECASE)
+_TITLE_RE = re.compile(r"write a 5-10 word title", re.IGNORECASE)
+_FILEPATHS_RE = re.compile(r"filepaths", re.IGNORECASE)
+# Every detector below needs one of these markers in user text. Matching them
+# case-insensitively only widens the net, so a miss rules all detectors out.
+_ANY_MARKER_RE = re.compile(
+    r"quota|write a 5-10 word title|<policy_spec>|\[SUGGESTION MODE:|Command:",
+    re.IGNORECASE,
+)
+
+
+def has_optimization_marker(request_data: MessagesRequest) -> bool:
+    """Cheap prefilter: could any fast-path detector match this request?
+
+    Scans each user message once for the union of detector markers, so the
+    common no-match request skips the individual detectors entirely.
+    """
+    return any(
+        msg.role == "user"
+        and _ANY_MARKER_RE.search(extract_text_from_content(msg.content))
+        for msg in request_data.messages
+    )
+
 
 def is_quota_check_request(request_data: MessagesRequest) -> bool:
     """Check if this is a quota probe request.
@@ -21,7 +47,7 @@ def is_quota_check_request(request_data: MessagesRequest) -> bool:
         and request_data.messages[0].role == "user"
     ):
         text = extract_text_from_content(request_data.messages[0].content)
-        if "quota" in text.lower():
+        if _QUOTA_RE.search(text):
             return True
     return False
 
@@ -34,7 +60,7 @@ def is_title_generation_request(request_data: MessagesRequest) -> bool:
     """
     if len(request_data.messages) > 0 and request_data.messages[-1].role == "user":
         text = extract_text_from_content(request_data.messages[-1].content)
-        if "write a 5-10 word title" in text.lower():
+        if _TITLE_RE.search(text):
             return True
     return False
 
@@ -53,10 +79,13 @@ def is_prefix_detection_request(request_data: MessagesRequest) -> tuple[bool, st
 
     content = extract_text_from_content(request_data.messages[0].content)
 
-    if "<policy_spec>" in content and "Command:" in content:
+    if "<policy_spec>" not in content:
+        return False, ""
+    # rfind doubles as the membership test and yields the slice start.
+    cmd_marker = content.rfind("Command:")
+    if cmd_marker != -1:
         try:
-            cmd_start = content.rfind("Command:") + len("Command:")
-            return True, content[cmd_start:].strip()
+            return True, content[cmd_marker + len("Command:") :].strip()
         except Exception:
             pass
 
@@ -99,7 +128,8 @@ def is_filepath_extraction_request(
     if "Command:" not in content or "Output:" not in content:
         return False, "", ""
 
-    if "filepaths" not in content.lower() and "<filepaths>" not in content.lower():
+    # "<filepaths>" contains "filepaths", so one search covers both markers.
+    if not _FILEPATHS_RE.search(content):
         return False, "", ""
 
     try:
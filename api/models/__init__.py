@@ -1,6 +1,7 @@
 """API models exports."""
 
 from .anthropic import (
+    ContentBlock,
     ContentBlockImage,
     ContentBlockText,
     ContentBlockThinking,
@@ -17,6 +18,7 @@ from .anthropic import (
 from .responses import MessagesResponse, TokenCountResponse, Usage
 
 __all__ = [
+    "ContentBlock",
     "ContentBlockImage",
     "ContentBlockText",
     "ContentBlockThinking",
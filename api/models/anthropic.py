@@ -1,36 +1,37 @@
 """Pydantic models for Anthropic-compatible requests."""
 
-from enum import StrEnum
-from typing import Any, Literal, Self
+from types import SimpleNamespace
+from typing import Annotated, Any, Literal, Self
 
 from loguru import logger
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
 from config.settings import get_settings
 from providers.model_utils import normalize_model_name
+from utils.text import sorted_json_text
 
 # =============================================================================
 # Content Block Types
 # =============================================================================
 
 
-class Role(StrEnum):
-    user = "user"
-    assistant = "assistant"
-    system = "system"
+USER = "user"
+ASSISTANT = "assistant"
+SYSTEM = "system"
+
+# Backward-compatible attribute access (Role.user, ...) without enum machinery.
+Role = SimpleNamespace(user=USER, assistant=ASSISTANT, system=SYSTEM)
 
 
 class ContentBlockText(BaseModel):
     type: Literal["text"]
     text: str = ""
 
-    @model_validator(mode="before")
+    @field_validator("text", mode="before")
     @classmethod
-    def coerce_none_text(cls, data: Any) -> Any:
+    def coerce_none_text(cls, v: Any) -> Any:
         """Model sometimes returns text: null — treat as empty string."""
-        if isinstance(data, dict) and data.get("text") is None:
-            return {**data, "text": ""}
-        return data
+        return "" if v is None else v
 
 
 class ContentBlockImage(BaseModel):
@@ -57,6 +58,17 @@ class ContentBlockThinking(BaseModel):
     signature: str | None = None  # Claude sometimes includes this field
 
 
+# Tagged union: Pydantic dispatches on "type" instead of trying each variant.
+ContentBlock = Annotated[
+    ContentBlockText
+    | ContentBlockImage
+    | ContentBlockToolUse
+    | ContentBlockToolResult
+    | ContentBlockThinking,
+    Field(discriminator="type"),
+]
+
+
 class SystemContent(BaseModel):
     type: Literal["text"]
     text: str
@@ -69,16 +81,7 @@ class SystemContent(BaseModel):
 
 class Message(BaseModel):
     role: Literal["user", "assistant"]
-    content: (
-        str
-        | list[
-            ContentBlockText
-            | ContentBlockImage
-            | ContentBlockToolUse
-            | ContentBlockToolResult
-            | ContentBlockThinking
-        ]
-    )
+    content: str | list[ContentBlock]
     reasoning_content: str | None = None
 
 
@@ -87,6 +90,20 @@ class Tool(BaseModel):
     description: str | None = None
     input_schema: dict[str, Any]
 
+    # (input_schema object, its JSON); keyed on identity so model_copy and
+    # reassignment re-serialize. In-place edits of the dict are not tracked.
+    _schema_cache: tuple[dict[str, Any], str] | None = PrivateAttr(default=None)
+
+    @property
+    def schema_json(self) -> str:
+        """Compact, key-sorted JSON of input_schema, serialized once per schema."""
+        schema = self.input_schema
+        cached = self._schema_cache
+        if cached is None or cached[0] is not schema:
+            cached = (schema, sorted_json_text(schema))
+            self._schema_cache = cached
+        return cached[1]
+
 
 class ThinkingConfig(BaseModel):
     """Supports both {enabled: true} and {type: "enabled"} formats."""
@@ -108,6 +125,15 @@ class ThinkingConfig(BaseModel):
 # =============================================================================
 
 
+def _default_model_for(metadata: dict[str, Any] | None) -> str:
+    """Resolve the default model for the provider this request targets."""
+    settings = get_settings()
+    provider_type = settings.provider_type
+    if metadata and "provider" in metadata:
+        provider_type = metadata["provider"]
+    return settings.default_model_for(provider_type)
+
+
 class MessagesRequest(BaseModel):
     model: str
     max_tokens: int | None = None
@@ -128,25 +154,14 @@ class MessagesRequest(BaseModel):
     @model_validator(mode="after")
     def map_model(self) -> Self:
         """Map any Claude model name to the configured provider-specific model."""
-        settings = get_settings()
         if self.original_model is None:
             self.original_model = self.model
 
-        # Determine which provider this request is going to
-        provider_type = settings.provider_type
-        if self.metadata and "provider" in self.metadata:
-            provider_type = self.metadata["provider"]
-
-        # Select the correct default model based on the provider
-        default_model = settings.model
-        if provider_type == "nvidia_nim" and settings.nvidia_nim_model:
-            default_model = settings.nvidia_nim_model
-        elif provider_type == "vertex_ai" and settings.vertex_ai_model:
-            default_model = settings.vertex_ai_model
-        elif provider_type == "open_router" and settings.open_router_model:
-            default_model = settings.open_router_model
-        elif provider_type == "lmstudio" and settings.lm_studio_model:
-            default_model = settings.lm_studio_model
+        default_model = _default_model_for(self.metadata)
+
+        # Already the provider-native model: nothing to normalize or log
+        if self.model == default_model:
+            return self
 
         # Use centralized model normalization
         normalized = normalize_model_name(self.model, default_model)
@@ -172,30 +187,16 @@ class TokenCountRequest(BaseModel):
     @model_validator(mode="after")
     def map_model(self) -> Self:
         """Map any Claude model name to the configured provider-specific model."""
-        settings = get_settings()
-
-        # Determine which provider this request is going to
-        provider_type = settings.provider_type
-        if self.metadata and "provider" in self.metadata:
-            provider_type = self.metadata["provider"]
-
-        # Select the correct default model based on the provider
-        default_model = settings.model
-        if provider_type == "nvidia_nim" and settings.nvidia_nim_model:
-            default_model = settings.nvidia_nim_model
-        elif provider_type == "vertex_ai" and settings.vertex_ai_model:
-            default_model = settings.vertex_ai_model
-        elif provider_type == "open_router" and settings.open_router_model:
-            default_model = settings.open_router_model
-        elif provider_type == "lmstudio" and settings.lm_studio_model:
-            default_model = settings.lm_studio_model
-
-        self.model = normalize_model_name(self.model, default_model)
+        default_model = _default_model_for(self.metadata)
+        if self.model != default_model:
+            self.model = normalize_model_name(self.model, default_model)
         return self
 
 
 # Force Pydantic to fully resolve all forward references.
 # force=True is required for Python 3.14 + Pydantic 2.12 compat —
 # without it the FastAPI TypeAdapter wrapper stays as a mock validator.
+# This is a one-time import cost; schemas are not deferred (defer_build is
+# False by default), so it is limited to these two top-level request models.
 MessagesRequest.model_rebuild(force=True)
 TokenCountRequest.model_rebuild(force=True)
@@ -1,11 +1,16 @@
 """Pydantic models for API responses."""
 
-from typing import Any, Literal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .anthropic import ContentBlockText, ContentBlockThinking, ContentBlockToolUse
 
+ResponseContentBlock = Annotated[
+    ContentBlockText | ContentBlockToolUse | ContentBlockThinking,
+    Field(discriminator="type"),
+]
+
 
 class TokenCountResponse(BaseModel):
     input_tokens: int
@@ -22,9 +27,7 @@ class MessagesResponse(BaseModel):
     id: str
     model: str
     role: Literal["assistant"] = "assistant"
-    content: list[
-        ContentBlockText | ContentBlockToolUse | ContentBlockThinking | dict[str, Any]
-    ]
+    content: list[ResponseContentBlock]
     type: Literal["message"] = "message"
     stop_reason: (
         Literal["end_turn", "max_tokens", "stop_sequence", "tool_use"] | None
@@ -4,7 +4,7 @@ Each handler returns a MessagesResponse if the request matches and the
 optimization is enabled, otherwise None.
 """
 
-import uuid
+from uuid import uuid4
 
 from loguru import logger
 
@@ -12,6 +12,7 @@ from config.settings import Settings
 
 from .command_utils import extract_command_prefix, extract_filepaths_from_command
 from .detection import (
+    has_optimization_marker,
     is_filepath_extraction_request,
     is_prefix_detection_request,
     is_quota_check_request,
@@ -34,7 +35,7 @@ def try_prefix_detection(
         return None
 
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{uuid4().hex}",
         model=request_data.model,
         content=[{"type": "text", "text": extract_command_prefix(command)}],
         stop_reason="end_turn",
@@ -53,7 +54,7 @@ def try_quota_mock(
 
     logger.info("Optimization: Intercepted and mocked quota probe")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{uuid4().hex}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": "Quota check passed."}],
@@ -73,7 +74,7 @@ def try_title_skip(
 
     logger.info("Optimization: Skipped title generation request")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{uuid4().hex}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": "Conversation"}],
@@ -93,7 +94,7 @@ def try_suggestion_skip(
 
     logger.info("Optimization: Skipped suggestion mode request")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{uuid4().hex}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": ""}],
@@ -116,7 +117,7 @@ def try_filepath_mock(
     filepaths = extract_filepaths_from_command(cmd, output)
     logger.info("Optimization: Mocked filepath extraction")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{uuid4().hex}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": filepaths}],
@@ -135,10 +136,25 @@ OPTIMIZATION_HANDLERS = [
 ]
 
 
+def _any_optimization_enabled(settings: Settings) -> bool:
+    return (
+        settings.enable_network_probe_mock
+        or settings.fast_prefix_detection
+        or settings.enable_title_generation_skip
+        or settings.enable_suggestion_mode_skip
+        or settings.enable_filepath_extraction_mock
+    )
+
+
 def try_optimizations(
     request_data: MessagesRequest, settings: Settings
 ) -> MessagesResponse | None:
     """Run optimization handlers in order. Returns first match or None."""
+    # Both checks are cheap gates; the user-text scan only runs when needed.
+    if not _any_optimization_enabled(settings):
+        return None
+    if not has_optimization_marker(request_data):
+        return None
     for handler in OPTIMIZATION_HANDLERS:
         result = handler(request_data, settings)
         if result is not None:
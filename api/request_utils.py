@@ -3,22 +3,115 @@
 Contains token counting for API requests.
 """
 
-import json
+import asyncio
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
-import tiktoken
 from loguru import logger
 
-ENCODER = tiktoken.get_encoding("cl100k_base")
+from utils.text import sorted_json_text
+from utils.tokens import get_encoder
 
-__all__ = ["get_token_count"]
+ENCODER = get_encoder()
+_ENCODE_THREADS = 4
+# Fragments at or above this length bypass the LRU. Together with the cache
+# size this bounds the request text the cache can pin to about 4M characters.
+_CACHEABLE_TEXT_LEN = 4096
+_TOKEN_CACHE_SIZE = 1024
+_MIN_IMAGE_TOKENS = 85
+_DEFAULT_IMAGE_TOKENS = 765  # Images without inline data (e.g. URL sources)
+# Below this many characters a thread hop costs more than counting inline.
+_OFFLOAD_THRESHOLD_CHARS = 4096
 
+__all__ = ["count_tokens_async", "get_token_count", "get_token_count_validated"]
 
-def _get_block_attr(block: Any, key: str, default: Any = "") -> Any:
-    """Get attribute from block (object or dict)."""
-    if isinstance(block, dict):
-        return block.get(key, default)
-    return getattr(block, key, default)
+
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
+def _cached_token_len(text: str) -> int:
+    """Token length of a fragment that is likely resent every turn."""
+    return len(ENCODER.encode_ordinary(text))
+
+
+def _json_text(value: Any) -> str:
+    """Serialize a JSON-compatible value to compact text for token estimation.
+
+    Keys are sorted so structurally equal schemas and inputs produce the same
+    text and share an entry in the token-length cache.
+    """
+    return sorted_json_text(value)
+
+
+# Field accessor for a block: dict.get for dicts, getattr for objects.
+# Both share the (block, key, default) call shape.
+_Getter = Callable[..., Any]
+
+
+def _block_getter(block: Any) -> _Getter:
+    """Pick the field accessor for a block once, instead of per field."""
+    return dict.get if isinstance(block, dict) else getattr
+
+
+# Block counters append text fragments to `texts` and return fixed token overhead.
+
+
+def _count_text_block(block: Any, get: _Getter, texts: list[str]) -> int:
+    texts.append(str(get(block, "text", "")))
+    return 0
+
+
+def _count_thinking_block(block: Any, get: _Getter, texts: list[str]) -> int:
+    texts.append(str(get(block, "thinking", "")))
+    return 0
+
+
+def _count_tool_use_block(block: Any, get: _Getter, texts: list[str]) -> int:
+    texts.append(str(get(block, "name", "")))
+    texts.append(_json_text(get(block, "input", {})))
+    texts.append(str(get(block, "id", "")))
+    return 15
+
+
+def _count_image_block(block: Any, get: _Getter, texts: list[str]) -> int:
+    # Size-based estimate from the encoded payload length (str or bytes);
+    # the image itself is never decoded.
+    source = get(block, "source", None)
+    if isinstance(source, dict):
+        data = source.get("data") or source.get("base64")
+        if data:
+            return max(_MIN_IMAGE_TOKENS, len(data) // 3000)
+    return _DEFAULT_IMAGE_TOKENS
+
+
+def _count_tool_result_block(block: Any, get: _Getter, texts: list[str]) -> int:
+    content = get(block, "content", "")
+    if isinstance(content, str):
+        texts.append(content)
+    else:
+        texts.append(_json_text(content))
+    texts.append(str(get(block, "tool_use_id", "")))
+    return 8
+
+
+def _count_unknown_block(block: Any, get: _Getter, texts: list[str]) -> int:
+    logger.debug(
+        "Unexpected block type %r, falling back to json/str encoding",
+        get(block, "type", None),
+    )
+    try:
+        texts.append(_json_text(block))
+    except TypeError, ValueError:
+        texts.append(str(block))
+    return 0
+
+
+_BLOCK_COUNTERS: dict[str, Callable[[Any, _Getter, list[str]], int]] = {
+    "text": _count_text_block,
+    "thinking": _count_thinking_block,
+    "tool_use": _count_tool_use_block,
+    "image": _count_image_block,
+    "tool_result": _count_tool_result_block,
+}
 
 
 def get_token_count(
@@ -30,78 +123,151 @@ def get_token_count(
 
     Uses tiktoken cl100k_base encoding to estimate token usage.
     Includes system prompt, messages, tools, and per-message overhead.
+    Short fragments (system prompts, tool schemas, earlier turns) are served
+    from an LRU cache; oversized fragments are encoded in a single batch call.
+    Blocks may be objects or plain dicts.
     """
+    return _estimate_tokens(messages, system, tools, validated=False)
+
+
+def get_token_count_validated(
+    messages: list,
+    system: str | list | None = None,
+    tools: list | None = None,
+) -> int:
+    """Estimate token count for Pydantic-validated request fields.
+
+    Same estimate as get_token_count, but every block is read by attribute
+    access with no dict fallback. Use for MessagesRequest/TokenCountRequest.
+    """
+    return _estimate_tokens(messages, system, tools, validated=True)
+
+
+async def count_tokens_async(
+    messages: list,
+    system: str | list | None = None,
+    tools: list | None = None,
+    *,
+    threshold_chars: int = _OFFLOAD_THRESHOLD_CHARS,
+) -> int:
+    """Estimate tokens for validated request fields without blocking the loop.
+
+    Small requests are counted inline; larger ones run get_token_count_validated
+    in a worker thread, where tiktoken's encoder releases the GIL.
+    """
+    if _approx_text_chars(messages, system, tools) < threshold_chars:
+        return get_token_count_validated(messages, system, tools)
+    return await asyncio.to_thread(get_token_count_validated, messages, system, tools)
+
+
+def _payload_chars(value: Any) -> int:
+    """Rough serialized size of a JSON-like payload, without serializing it."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + _payload_chars(item) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return sum(map(_payload_chars, value))
+    return 8  # Numbers, booleans and null
+
+
+def _approx_block_chars(block: Any) -> int:
+    block_type = block.type
+    if block_type == "text":
+        return len(block.text)
+    if block_type == "thinking":
+        return len(block.thinking)
+    if block_type == "tool_use":
+        return len(block.name) + _payload_chars(block.input)
+    if block_type == "tool_result":
+        return _payload_chars(block.content)
+    # Images are estimated from their size and never tokenized.
+    return 0
+
+
+def _approx_text_chars(
+    messages: list, system: str | list | None, tools: list | None
+) -> int:
+    """Cheap size estimate used to decide whether counting is worth offloading."""
+    if isinstance(system, str):
+        chars = len(system)
+    elif system:
+        chars = sum(len(block.text) for block in system)
+    else:
+        chars = 0
+    for msg in messages:
+        content = msg.content
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(map(_approx_block_chars, content))
+    if tools:
+        # schema_json is memoized on the tool and reused by the count itself.
+        chars += sum(
+            len(tool.name) + len(tool.description or "") + len(tool.schema_json)
+            for tool in tools
+        )
+    return chars
+
+
+def _estimate_tokens(
+    messages: list,
+    system: str | list | None,
+    tools: list | None,
+    *,
+    validated: bool,
+) -> int:
+    texts: list[str] = []
     total_tokens = 0
 
     if system:
         if isinstance(system, str):
-            total_tokens += len(ENCODER.encode(system))
+            texts.append(system)
         elif isinstance(system, list):
             for block in system:
-                text = _get_block_attr(block, "text", "")
+                get = getattr if validated else _block_getter(block)
+                text = get(block, "text", "")
                 if text:
-                    total_tokens += len(ENCODER.encode(str(text)))
+                    texts.append(str(text))
         total_tokens += 4  # System block formatting overhead
 
     for msg in messages:
         if isinstance(msg.content, str):
-            total_tokens += len(ENCODER.encode(msg.content))
+            texts.append(msg.content)
         elif isinstance(msg.content, list):
             for block in msg.content:
-                b_type = _get_block_attr(block, "type") or None
-
-                if b_type == "text":
-                    text = _get_block_attr(block, "text", "")
-                    total_tokens += len(ENCODER.encode(str(text)))
-                elif b_type == "thinking":
-                    thinking = _get_block_attr(block, "thinking", "")
-                    total_tokens += len(ENCODER.encode(str(thinking)))
-                elif b_type == "tool_use":
-                    name = _get_block_attr(block, "name", "")
-                    inp = _get_block_attr(block, "input", {})
-                    block_id = _get_block_attr(block, "id", "")
-                    total_tokens += len(ENCODER.encode(str(name)))
-                    total_tokens += len(ENCODER.encode(json.dumps(inp)))
-                    total_tokens += len(ENCODER.encode(str(block_id)))
-                    total_tokens += 15
-                elif b_type == "image":
-                    source = _get_block_attr(block, "source")
-                    if isinstance(source, dict):
-                        data = source.get("data") or source.get("base64") or ""
-                        if data:
-                            total_tokens += max(85, len(data) // 3000)
-                        else:
-                            total_tokens += 765
-                    else:
-                        total_tokens += 765
-                elif b_type == "tool_result":
-                    content = _get_block_attr(block, "content", "")
-                    tool_use_id = _get_block_attr(block, "tool_use_id", "")
-                    if isinstance(content, str):
-                        total_tokens += len(ENCODER.encode(content))
-                    else:
-                        total_tokens += len(ENCODER.encode(json.dumps(content)))
-                    total_tokens += len(ENCODER.encode(str(tool_use_id)))
-                    total_tokens += 8
-                else:
-                    logger.debug(
-                        "Unexpected block type %r, falling back to json/str encoding",
-                        b_type,
-                    )
-                    try:
-                        total_tokens += len(ENCODER.encode(json.dumps(block)))
-                    except TypeError, ValueError:
-                        total_tokens += len(ENCODER.encode(str(block)))
+                get = getattr if validated else _block_getter(block)
+                counter = _BLOCK_COUNTERS.get(
+                    get(block, "type", None), _count_unknown_block
+                )
+                total_tokens += counter(block, get, texts)
 
     if tools:
         for tool in tools:
-            tool_str = (
-                tool.name + (tool.description or "") + json.dumps(tool.input_schema)
-            )
-            total_tokens += len(ENCODER.encode(tool_str))
+            # Validated Tool models memoize their schema JSON on the instance.
+            schema = tool.schema_json if validated else _json_text(tool.input_schema)
+            texts.append(tool.name + (tool.description or "") + schema)
+
+    large_texts: list[str] = []
+    for text in texts:
+        if len(text) < _CACHEABLE_TEXT_LEN:
+            total_tokens += _cached_token_len(text)
+        else:
+            large_texts.append(text)
+    if large_texts:
+        # No point spinning up more worker threads than there are fragments.
+        encoded = ENCODER.encode_ordinary_batch(
+            large_texts, num_threads=min(_ENCODE_THREADS, len(large_texts))
+        )
+        total_tokens += sum(map(len, encoded))
 
     total_tokens += len(messages) * 4
     if tools:
         total_tokens += len(tools) * 5
 
     return max(1, total_tokens)
+
+
+# Touch the BPE ranks and compile the split regex at import time so the first
+# request does not pay that one-time cost.
+ENCODER.encode_ordinary("warmup " * 32)
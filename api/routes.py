@@ -1,14 +1,13 @@
 """FastAPI route handlers."""
 
-import json
 import uuid
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from loguru import logger
 
 from config.settings import Settings
-from providers.base import BaseProvider
 from providers.exceptions import ProviderError
 from providers.logging_utils import build_request_summary, log_request_compact
 
@@ -16,7 +15,7 @@ from .dependencies import get_provider_factory, get_settings
 from .models.anthropic import MessagesRequest, TokenCountRequest
 from .models.responses import TokenCountResponse
 from .optimization_handlers import try_optimizations
-from .request_utils import get_token_count
+from .request_utils import count_tokens_async
 
 router = APIRouter()
 
@@ -48,7 +47,7 @@ async def create_message(
         request_id = f"req_{uuid.uuid4().hex[:12]}"
         log_request_compact(logger, request_id, request_data)
 
-        input_tokens = get_token_count(
+        input_tokens = await count_tokens_async(
             request_data.messages, request_data.system, request_data.tools
         )
         return StreamingResponse(
@@ -82,13 +81,13 @@ async def count_tokens(request_data: TokenCountRequest):
     request_id = f"req_{uuid.uuid4().hex[:12]}"
     with logger.contextualize(request_id=request_id):
         try:
-            tokens = get_token_count(
+            tokens = await count_tokens_async(
                 request_data.messages, request_data.system, request_data.tools
             )
             summary = build_request_summary(request_data)
             summary["request_id"] = request_id
             summary["input_tokens"] = tokens
-            logger.info("COUNT_TOKENS: %s", json.dumps(summary))
+            logger.info("COUNT_TOKENS: {}", orjson.dumps(summary).decode())
             return TokenCountResponse(input_tokens=tokens)
         except Exception as e:
             import traceback
@@ -7,14 +7,21 @@ included at top level for easy grep/filter.
 """
 
 import asyncio
-import json
 import logging
 import os
 
+import orjson
 from loguru import logger
 
 _configured = False
 
+# Frames from this file belong to stdlib logging and are skipped when
+# locating the original caller.
+_LOGGING_FILE = logging.__file__
+
+# Stdlib level name -> loguru level (name, or levelno for custom levels)
+_LEVEL_CACHE: dict[str, str | int] = {}
+
 # Context keys we promote to top-level JSON for traceability
 _CONTEXT_KEYS = ("request_id", "node_id", "chat_id")
 
@@ -35,7 +42,7 @@ def _serialize_with_context(record) -> str:
     for key in _CONTEXT_KEYS:
         if key in extra and extra[key] is not None:
             out[key] = extra[key]
-    record["_json"] = json.dumps(out, default=str)
+    record["_json"] = orjson.dumps(out, default=str).decode()
     return "{_json}\n"
 
 
@@ -43,13 +50,16 @@ class InterceptHandler(logging.Handler):
     """Redirect stdlib logging to loguru."""
 
     def emit(self, record: logging.LogRecord) -> None:
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        level = _LEVEL_CACHE.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            _LEVEL_CACHE[record.levelname] = level
 
         frame, depth = logging.currentframe(), 2
-        while frame is not None and frame.f_code.co_filename == logging.__file__:
+        while frame is not None and frame.f_code.co_filename == _LOGGING_FILE:
             frame = frame.f_back
             depth += 1
 
@@ -58,14 +68,15 @@ class InterceptHandler(logging.Handler):
         )
 
 
-async def _truncate_log_periodically(log_file: str, interval_seconds: int = 86400) -> None:
+async def _truncate_log_periodically(
+    log_file: str, interval_seconds: int = 86400
+) -> None:
     """Periodically truncate the given log file."""
     while True:
         await asyncio.sleep(interval_seconds)
         try:
-            # truncate -s 0 equivalent in Python
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.truncate()
+            # truncate -s 0; safe while the sink keeps appending to its own fd
+            os.truncate(log_file, 0)
         except Exception as e:
             logger.error(f"Failed to truncate log file {log_file}: {e}")
 
@@ -85,7 +96,10 @@ def configure_logging(log_file: str, *, force: bool = False) -> None:
     logger.remove()
 
     # Truncate log file on fresh start for clean debugging
-    open(log_file, "w", encoding="utf-8").close()
+    os.close(os.open(log_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+
+    # File sinks are enqueued: a background thread does the writes, so request
+    # handlers never block on file I/O. Call logger.complete() to drain.
 
     # Add file sink: JSON lines, DEBUG level, context vars at top level
     logger.add(
@@ -94,6 +108,7 @@ def configure_logging(log_file: str, *, force: bool = False) -> None:
         format=_serialize_with_context,
         encoding="utf-8",
         mode="a",
+        enqueue=True,
     )
 
     # Add error file sink: JSON lines, ERROR level, NEVER TRUNCATED
@@ -104,6 +119,7 @@ def configure_logging(log_file: str, *, force: bool = False) -> None:
         format=_serialize_with_context,
         encoding="utf-8",
         mode="a",
+        enqueue=True,
     )
 
     # Start background task to truncate the main log file every 24 hours
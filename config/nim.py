@@ -1,8 +1,22 @@
 """NVIDIA NIM settings (fixed values, no env config)."""
 
-from typing import Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+
+
+def _empty_to_none_int(v: Any) -> int | None:
+    if v == "" or v is None:
+        return None
+    return int(v)
+
+
+def _empty_to_none_str(v: Any) -> Any:
+    return None if v == "" else v
+
+
+_OptionalInt = Annotated[int | None, BeforeValidator(_empty_to_none_int)]
+_OptionalStr = Annotated[str | None, BeforeValidator(_empty_to_none_str)]
 
 
 class NimSettings(BaseModel):
@@ -10,7 +24,7 @@ class NimSettings(BaseModel):
 
     temperature: float = Field(1.0, ge=0.0)
     top_p: float = Field(1.0, ge=0.0, le=1.0)
-    top_k: int = -1
+    top_k: int = Field(-1, ge=-1)  # -1 disables top-k
     max_tokens: int = Field(81920, ge=1)
     presence_penalty: float = Field(0.0, ge=-2.0, le=2.0)
     frequency_penalty: float = Field(0.0, ge=-2.0, le=2.0)
@@ -18,8 +32,8 @@ class NimSettings(BaseModel):
     min_p: float = Field(0.0, ge=0.0, le=1.0)
     repetition_penalty: float = Field(1.0, ge=0.0)
 
-    seed: int | None = None
-    stop: str | None = None
+    seed: _OptionalInt = None
+    stop: _OptionalStr = None
 
     parallel_tool_calls: bool = True
     return_tokens_as_token_ids: bool = False
@@ -27,31 +41,15 @@ class NimSettings(BaseModel):
     ignore_eos: bool = False
 
     min_tokens: int = Field(0, ge=0)
-    chat_template: str | None = None
-    request_id: str | None = None
+    chat_template: _OptionalStr = None
+    request_id: _OptionalStr = None
 
     reasoning_effort: Literal["low", "medium", "high"] = "high"
     include_reasoning: bool = True
 
-    model_config = ConfigDict(extra="forbid")
-
-    @field_validator("top_k")
-    @classmethod
-    def validate_top_k(cls, v):
-        if v < -1:
-            raise ValueError("top_k must be -1 or >= 0")
-        return v
-
-    @field_validator("seed", mode="before")
-    @classmethod
-    def parse_optional_int(cls, v):
-        if v == "" or v is None:
-            return None
-        return int(v)
-
-    @field_validator("stop", "chat_template", "request_id", mode="before")
-    @classmethod
-    def parse_optional_str(cls, v):
-        if v == "":
-            return None
-        return v
+    # Immutable so one validated instance can be shared by every caller;
+    # derive variants with model_copy(update=...).
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+DEFAULT_NIM_SETTINGS = NimSettings()
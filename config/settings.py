@@ -6,12 +6,18 @@ from dotenv import load_dotenv
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from .nim import NimSettings
+from .nim import DEFAULT_NIM_SETTINGS, NimSettings
 
 load_dotenv()
 
-# Fixed base URL for NVIDIA NIM
-NVIDIA_NIM_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+# Settings field holding each provider's model override.
+_PROVIDER_MODEL_FIELDS = {
+    "nvidia_nim": "nvidia_nim_model",
+    "vertex_ai": "vertex_ai_model",
+    "open_router": "open_router_model",
+    "lmstudio": "lm_studio_model",
+}
 
 
 class Settings(BaseSettings):
@@ -83,7 +89,7 @@ class Settings(BaseSettings):
     enable_filepath_extraction_mock: bool = True
 
     # ==================== NIM Settings ====================
-    nim: NimSettings = Field(default_factory=NimSettings)
+    nim: NimSettings = DEFAULT_NIM_SETTINGS
 
     # ==================== Voice Note Transcription ====================
     voice_note_enabled: bool = Field(
@@ -135,6 +141,21 @@ class Settings(BaseSettings):
             raise ValueError(f"whisper_device must be 'cpu' or 'cuda', got {v!r}")
         return v
 
+    def default_model_for(self, provider_type: object) -> str:
+        """Model that Claude model names map to for the given provider.
+
+        provider_type may come from client-supplied request metadata, so
+        anything other than a string falls back to the global model.
+        Read on every call so model_copy(update=...) and field assignment
+        are always reflected.
+        """
+        if not isinstance(provider_type, str):
+            return self.model
+        field_name = _PROVIDER_MODEL_FIELDS.get(provider_type)
+        if field_name is None:
+            return self.model
+        return getattr(self, field_name) or self.model
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,12 +1,35 @@
-"""Platform-agnostic messaging layer."""
+"""Platform-agnostic messaging layer.
 
-from .base import CLISession, MessagingPlatform, SessionManagerInterface
-from .event_parser import parse_cli_event
-from .handler import ClaudeMessageHandler
-from .models import IncomingMessage
-from .session import SessionStore
-from .tree_data import MessageNode, MessageState, MessageTree
-from .tree_queue import TreeQueueManager
+Exports resolve on first access, so importing a single submodule (e.g.
+messaging.limiter) does not load the handler and markdown renderers.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base import CLISession, MessagingPlatform, SessionManagerInterface
+    from .event_parser import parse_cli_event
+    from .handler import ClaudeMessageHandler
+    from .models import IncomingMessage
+    from .session import SessionStore
+    from .tree_data import MessageNode, MessageState, MessageTree
+    from .tree_queue import TreeQueueManager
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "CLISession": ".base",
+    "MessagingPlatform": ".base",
+    "SessionManagerInterface": ".base",
+    "parse_cli_event": ".event_parser",
+    "ClaudeMessageHandler": ".handler",
+    "IncomingMessage": ".models",
+    "SessionStore": ".session",
+    "MessageNode": ".tree_data",
+    "MessageState": ".tree_data",
+    "MessageTree": ".tree_data",
+    "TreeQueueManager": ".tree_queue",
+}
 
 __all__ = [
     "CLISession",
@@ -21,3 +44,16 @@ __all__ = [
     "TreeQueueManager",
     "parse_cli_event",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,28 @@
-"""Backward-compatible re-export. Use messaging.platforms.discord for new code."""
+"""Backward-compatible re-export. Use messaging.platforms.discord for new code.
 
-from .platforms.discord import (
-    DISCORD_AVAILABLE,
-    DISCORD_MESSAGE_LIMIT,
-    DiscordPlatform,
-    _get_discord,
-    _parse_allowed_channels,
-)
+Names resolve on first access, so importing this module does not load discord.py.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .platforms.discord import (
+        DISCORD_AVAILABLE,
+        DISCORD_MESSAGE_LIMIT,
+        DiscordPlatform,
+        _get_discord,
+        _parse_allowed_channels,
+    )
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "DISCORD_AVAILABLE": ".platforms.discord",
+    "DISCORD_MESSAGE_LIMIT": ".platforms.discord",
+    "DiscordPlatform": ".platforms.discord",
+    "_get_discord": ".platforms.discord",
+    "_parse_allowed_channels": ".platforms.discord",
+}
 
 __all__ = [
     "DISCORD_AVAILABLE",
@@ -15,3 +31,16 @@ __all__ = [
     "_get_discord",
     "_parse_allowed_channels",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
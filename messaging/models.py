@@ -5,7 +5,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class IncomingMessage:
     """
     Platform-agnostic incoming message.
@@ -119,9 +119,7 @@ class DiscordPlatform(MessagingPlatform):
         for att in message.attachments:
             ct = (att.content_type or "").lower()
             fn = (att.filename or "").lower()
-            if ct.startswith("audio/") or any(
-                fn.endswith(ext) for ext in AUDIO_EXTENSIONS
-            ):
+            if ct.startswith("audio/") or fn.endswith(AUDIO_EXTENSIONS):
                 return att
         return None
 
@@ -154,12 +152,8 @@ class DiscordPlatform(MessagingPlatform):
             else None
         )
 
-        ext = ".ogg"
         fn = (attachment.filename or "").lower()
-        for e in AUDIO_EXTENSIONS:
-            if fn.endswith(e):
-                ext = e
-                break
+        ext = next((e for e in AUDIO_EXTENSIONS if fn.endswith(e)), ".ogg")
         ct = attachment.content_type or "audio/ogg"
         if "mp4" in ct or "m4a" in fn:
             ext = ".m4a" if "m4a" in fn else ".mp4"
@@ -5,17 +5,20 @@ Used by the message handler and Discord platform adapter.
 """
 
 import re
+from functools import lru_cache
 
 from markdown_it import MarkdownIt
 
 # Discord escapes: \ * _ ` ~ | >
 DISCORD_SPECIAL = set("\\*_`~|>")
+_DISCORD_ESCAPE_TABLE = str.maketrans({ch: f"\\{ch}" for ch in DISCORD_SPECIAL})
 
 _MD = MarkdownIt("commonmark", {"html": False, "breaks": False})
 _MD.enable("strikethrough")
 _MD.enable("table")
 
-_TABLE_SEP_RE = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)+\|?\s*$")
+# Used with fullmatch, so the pattern carries no ^/$ anchors.
+_TABLE_SEP_RE = re.compile(r"\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)+\|?\s*")
 _FENCE_RE = re.compile(r"^\s*```")
 
 
@@ -23,12 +26,10 @@ def _is_gfm_table_header_line(line: str) -> bool:
     """Check if line is a GFM table header."""
     if "|" not in line:
         return False
-    if _TABLE_SEP_RE.match(line):
+    if _TABLE_SEP_RE.fullmatch(line):
         return False
-    stripped = line.strip()
-    parts = [p.strip() for p in stripped.strip("|").split("|")]
-    parts = [p for p in parts if p != ""]
-    return len(parts) >= 2
+    cells = line.strip().strip("|").split("|")
+    return sum(1 for cell in cells if cell.strip()) >= 2
 
 
 def _normalize_gfm_tables(text: str) -> str:
@@ -50,13 +51,12 @@ def _normalize_gfm_tables(text: str) -> str:
             not in_fence
             and idx + 1 < len(lines)
             and _is_gfm_table_header_line(line)
-            and _TABLE_SEP_RE.match(lines[idx + 1])
+            and _TABLE_SEP_RE.fullmatch(lines[idx + 1])
             and out_lines
             and out_lines[-1].strip() != ""
         ):
-            m = re.match(r"^(\s*)", line)
-            indent = m.group(1) if m else ""
-            out_lines.append(indent)
+            # Keep the header's indentation on the inserted blank line.
+            out_lines.append(line[: len(line) - len(line.lstrip())])
 
         out_lines.append(line)
 
@@ -65,7 +65,7 @@ def _normalize_gfm_tables(text: str) -> str:
 
 def escape_discord(text: str) -> str:
     """Escape text for Discord markdown (bold, italic, etc.)."""
-    return "".join(f"\\{ch}" if ch in DISCORD_SPECIAL else ch for ch in text)
+    return text.translate(_DISCORD_ESCAPE_TABLE)
 
 
 def escape_discord_code(text: str) -> str:
@@ -99,8 +99,13 @@ def format_status(emoji: str, label: str, suffix: str | None = None) -> str:
     return base
 
 
+@lru_cache(maxsize=512)
 def render_markdown_to_discord(text: str) -> str:
-    """Render common Markdown into Discord-compatible format."""
+    """Render common Markdown into Discord-compatible format.
+
+    Output depends only on the input, so results are memoized: streaming
+    status edits re-render the same transcript prefix many times.
+    """
     if not text:
         return ""
 
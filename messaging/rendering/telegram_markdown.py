@@ -5,17 +5,21 @@ Used by the message handler and Telegram platform adapter.
 """
 
 import re
+from functools import lru_cache
 
 from markdown_it import MarkdownIt
 
 MDV2_SPECIAL_CHARS = set("\\_*[]()~`>#+-=|{}.!")
 MDV2_LINK_ESCAPE = set("\\)")
+_MDV2_ESCAPE_TABLE = str.maketrans({ch: f"\\{ch}" for ch in MDV2_SPECIAL_CHARS})
+_MDV2_LINK_ESCAPE_TABLE = str.maketrans({ch: f"\\{ch}" for ch in MDV2_LINK_ESCAPE})
 
 _MD = MarkdownIt("commonmark", {"html": False, "breaks": False})
 _MD.enable("strikethrough")
 _MD.enable("table")
 
-_TABLE_SEP_RE = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)+\|?\s*$")
+# Used with fullmatch, so the pattern carries no ^/$ anchors.
+_TABLE_SEP_RE = re.compile(r"\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)+\|?\s*")
 _FENCE_RE = re.compile(r"^\s*```")
 
 
@@ -23,12 +27,10 @@ def _is_gfm_table_header_line(line: str) -> bool:
     """Check if line is a GFM table header (pipe-delimited, not separator)."""
     if "|" not in line:
         return False
-    if _TABLE_SEP_RE.match(line):
+    if _TABLE_SEP_RE.fullmatch(line):
         return False
-    stripped = line.strip()
-    parts = [p.strip() for p in stripped.strip("|").split("|")]
-    parts = [p for p in parts if p != ""]
-    return len(parts) >= 2
+    cells = line.strip().strip("|").split("|")
+    return sum(1 for cell in cells if cell.strip()) >= 2
 
 
 def _normalize_gfm_tables(text: str) -> str:
@@ -56,13 +58,12 @@ def _normalize_gfm_tables(text: str) -> str:
             not in_fence
             and idx + 1 < len(lines)
             and _is_gfm_table_header_line(line)
-            and _TABLE_SEP_RE.match(lines[idx + 1])
+            and _TABLE_SEP_RE.fullmatch(lines[idx + 1])
             and out_lines
             and out_lines[-1].strip() != ""
         ):
-            m = re.match(r"^(\s*)", line)
-            indent = m.group(1) if m else ""
-            out_lines.append(indent)
+            # Keep the header's indentation on the inserted blank line.
+            out_lines.append(line[: len(line) - len(line.lstrip())])
 
         out_lines.append(line)
 
@@ -71,7 +72,7 @@ def _normalize_gfm_tables(text: str) -> str:
 
 def escape_md_v2(text: str) -> str:
     """Escape text for Telegram MarkdownV2."""
-    return "".join(f"\\{ch}" if ch in MDV2_SPECIAL_CHARS else ch for ch in text)
+    return text.translate(_MDV2_ESCAPE_TABLE)
 
 
 def escape_md_v2_code(text: str) -> str:
@@ -81,7 +82,7 @@ def escape_md_v2_code(text: str) -> str:
 
 def escape_md_v2_link_url(text: str) -> str:
     """Escape URL for Telegram MarkdownV2 link destination."""
-    return "".join(f"\\{ch}" if ch in MDV2_LINK_ESCAPE else ch for ch in text)
+    return text.translate(_MDV2_LINK_ESCAPE_TABLE)
 
 
 def mdv2_bold(text: str) -> str:
@@ -102,8 +103,13 @@ def format_status(emoji: str, label: str, suffix: str | None = None) -> str:
     return base
 
 
+@lru_cache(maxsize=512)
 def render_markdown_to_mdv2(text: str) -> str:
-    """Render common Markdown into Telegram MarkdownV2."""
+    """Render common Markdown into Telegram MarkdownV2.
+
+    Output depends only on the input, so results are memoized: streaming
+    status edits re-render the same transcript prefix many times.
+    """
     if not text:
         return ""
 
@@ -5,12 +5,12 @@ Provides persistent storage for mapping platform messages to Claude CLI session
 and message trees for conversation continuation.
 """
 
-import json
 import os
 import threading
 from datetime import UTC, datetime
 from typing import Any
 
+import orjson
 from loguru import logger
 
 
@@ -50,8 +50,8 @@ class SessionStore:
             return
 
         try:
-            with open(self.storage_path, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(self.storage_path, "rb") as f:
+                data = orjson.loads(f.read())
 
             # Load trees
             self._trees = data.get("trees", {})
@@ -103,8 +103,9 @@ class SessionStore:
                 "node_to_tree": self._node_to_tree,
                 "message_log": self._message_log,
             }
-            with open(self.storage_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            with open(self.storage_path, "wb") as f:
+                f.write(payload)
         except Exception as e:
             logger.error(f"Failed to save sessions: {e}")
 
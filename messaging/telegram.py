@@ -1,15 +1,37 @@
-"""Backward-compatible re-export. Use messaging.platforms.telegram for new code."""
+"""Backward-compatible re-export. Use messaging.platforms.telegram for new code.
 
-from .platforms.telegram import (
-    TELEGRAM_AVAILABLE,
-    TelegramPlatform,
-)
+Names resolve on first access, so importing this module does not load
+python-telegram-bot. The telegram.error types (NetworkError, RetryAfter,
+TelegramError) are also available when python-telegram-bot is installed.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .platforms.telegram import TELEGRAM_AVAILABLE, TelegramPlatform
+
+# Exported name -> submodule that defines it. The error types only exist on
+# the platform module when the SDK imported.
+_EXPORTS = {
+    "TELEGRAM_AVAILABLE": ".platforms.telegram",
+    "TelegramPlatform": ".platforms.telegram",
+    "NetworkError": ".platforms.telegram",
+    "RetryAfter": ".platforms.telegram",
+    "TelegramError": ".platforms.telegram",
+}
 
-# Re-export telegram.error types when python-telegram-bot is installed
 __all__ = ["TELEGRAM_AVAILABLE", "TelegramPlatform"]
-try:
-    from telegram.error import NetworkError, RetryAfter, TelegramError
 
-    __all__ += ["NetworkError", "RetryAfter", "TelegramError"]
-except ImportError:
-    pass
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
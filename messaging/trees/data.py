@@ -37,6 +37,14 @@ class _SnapshotQueue(asyncio.Queue[str]):
         object.__setattr__(self, "_queue", deque(x for x in self._queue if x != item))
         return True
 
+    def remove_many(self, items: set[str]) -> int:
+        """Remove every queued item in items with one pass. Returns count removed."""
+        kept = deque(x for x in self._queue if x not in items)
+        removed = len(self._queue) - len(kept)
+        if removed:
+            object.__setattr__(self, "_queue", kept)
+        return removed
+
 
 class MessageState(Enum):
     """State of a message node in the tree."""
@@ -47,7 +55,13 @@ class MessageState(Enum):
     ERROR = "error"  # Processing failed
 
 
-@dataclass
+# Tuples rather than sets: `in` on a tuple short-circuits on identity, while a
+# set lookup goes through Enum.__hash__, which is implemented in Python.
+ACTIVE_STATES = (MessageState.PENDING, MessageState.IN_PROGRESS)
+TERMINAL_STATES = (MessageState.COMPLETED, MessageState.ERROR)
+
+
+@dataclass(slots=True)
 class MessageNode:
     """
     A node in the message tree.
@@ -146,6 +160,14 @@ class MessageTree:
         self._status_to_node: dict[str, str] = {
             root_node.status_message_id: root_node.node_id
         }
+        # Superset of PENDING/IN_PROGRESS node IDs. Some callers set
+        # node.state directly, so entries are pruned lazily in active_nodes().
+        self._active_ids: set[str] = set()
+        if root_node.state in ACTIVE_STATES:
+            self._active_ids.add(root_node.node_id)
+        # node_id -> subtree IDs; entries on a changed node's ancestor chain
+        # are dropped by add_node and remove_branch.
+        self._descendants_cache: dict[str, tuple[str, ...]] = {}
         self._queue: _SnapshotQueue = _SnapshotQueue()
         self._lock = asyncio.Lock()
         self._is_processing = False
@@ -196,7 +218,9 @@ class MessageTree:
 
             self._nodes[node_id] = node
             self._status_to_node[status_message_id] = node_id
+            self._active_ids.add(node_id)
             self._nodes[parent_id].children_ids.append(node_id)
+            self._invalidate_descendants(parent_id)
 
             logger.debug(f"Added node {node_id} as child of {parent_id}")
             return node
@@ -246,16 +270,54 @@ class MessageTree:
                 logger.warning(f"Node {node_id} not found for state update")
                 return
 
-            node.state = state
-            if session_id:
-                node.session_id = session_id
-            if error_message:
-                node.error_message = error_message
-            if state in (MessageState.COMPLETED, MessageState.ERROR):
-                node.completed_at = datetime.now(UTC)
-
+            self._apply_state(node, state, session_id, error_message)
             logger.debug(f"Node {node_id} state -> {state.value}")
 
+    async def update_states_bulk(
+        self,
+        node_ids: list[str],
+        state: MessageState,
+        error_message: str | None = None,
+    ) -> list[MessageNode]:
+        """Update several nodes' state under a single lock acquisition.
+
+        Returns:
+            The nodes that were found and updated.
+        """
+        updated: list[MessageNode] = []
+        now = datetime.now(UTC)
+        async with self._lock:
+            for node_id in node_ids:
+                node = self._nodes.get(node_id)
+                if node:
+                    self._apply_state(node, state, None, error_message, now)
+                    updated.append(node)
+        if updated:
+            logger.debug(f"{len(updated)} nodes state -> {state.value}")
+        return updated
+
+    def _apply_state(
+        self,
+        node: MessageNode,
+        state: MessageState,
+        session_id: str | None,
+        error_message: str | None,
+        now: datetime | None = None,
+    ) -> None:
+        """Mutate a node's state fields. Caller must hold lock.
+
+        Bulk callers pass one shared `now` instead of reading the clock per node.
+        """
+        node.state = state
+        if state in ACTIVE_STATES:
+            self._active_ids.add(node.node_id)
+        if session_id:
+            node.session_id = session_id
+        if error_message:
+            node.error_message = error_message
+        if state in TERMINAL_STATES:
+            node.completed_at = now or datetime.now(UTC)
+
     async def enqueue(self, node_id: str) -> int:
         """
         Add a node to the processing queue.
@@ -303,12 +365,25 @@ class MessageTree:
         """
         return self._queue.remove_if_present(node_id)
 
+    def remove_many_from_queue(self, node_ids: set[str]) -> int:
+        """
+        Remove all of node_ids from the internal queue in a single pass.
+
+        Caller must hold the tree lock (e.g. via with_lock).
+        Returns the number of queue entries removed.
+        """
+        return self._queue.remove_many(node_ids)
+
     @asynccontextmanager
     async def with_lock(self):
         """Async context manager for tree lock. Use when multiple operations need atomicity."""
         async with self._lock:
             yield
 
+    def is_locked(self) -> bool:
+        """Check if some task currently holds the tree lock."""
+        return self._lock.locked()
+
     def set_processing_state(self, node_id: str | None, is_processing: bool) -> None:
         """Set processing state. Caller must hold lock for consistency with queue operations."""
         self._is_processing = is_processing
@@ -386,6 +461,8 @@ class MessageTree:
                 node = MessageNode.from_dict(node_data)
                 tree._nodes[node_id] = node
                 tree._status_to_node[node.status_message_id] = node_id
+                if node.state in ACTIVE_STATES:
+                    tree._active_ids.add(node_id)
 
         return tree
 
@@ -393,6 +470,34 @@ class MessageTree:
         """Get all nodes in the tree."""
         return list(self._nodes.values())
 
+    def active_nodes(self) -> list[MessageNode]:
+        """
+        Get nodes that are PENDING or IN_PROGRESS without walking the tree.
+
+        Caller must hold lock for consistency, as with all_nodes().
+        """
+        nodes: list[MessageNode] = []
+        for nid in list(self._active_ids):
+            node = self._nodes.get(nid)
+            if node and node.state in ACTIVE_STATES:
+                nodes.append(node)
+            else:
+                self._active_ids.discard(nid)
+        return nodes
+
+    def fail_active_nodes(self, error_message: str) -> list[MessageNode]:
+        """
+        Mark every PENDING/IN_PROGRESS node as ERROR and empty the active index.
+
+        Does not acquire lock; caller must ensure no concurrent processing.
+        """
+        nodes = self.active_nodes()
+        for node in nodes:
+            node.state = MessageState.ERROR
+            node.error_message = error_message
+        self._active_ids.clear()
+        return nodes
+
     def has_node(self, node_id: str) -> bool:
         """Check if a node exists in this tree."""
         return node_id in self._nodes
@@ -411,15 +516,25 @@ class MessageTree:
         """
         if node_id not in self._nodes:
             return []
-        result: list[str] = []
-        stack = [node_id]
-        while stack:
-            nid = stack.pop()
-            result.append(nid)
-            node = self._nodes.get(nid)
-            if node:
-                stack.extend(node.children_ids)
-        return result
+        cached = self._descendants_cache.get(node_id)
+        if cached is None:
+            result: list[str] = []
+            stack = [node_id]
+            while stack:
+                nid = stack.pop()
+                result.append(nid)
+                node = self._nodes.get(nid)
+                if node:
+                    stack.extend(node.children_ids)
+            cached = self._descendants_cache[node_id] = tuple(result)
+        return list(cached)
+
+    def _invalidate_descendants(self, node_id: str | None) -> None:
+        """Drop cached subtrees for node_id and its ancestors (O(depth))."""
+        while node_id is not None:
+            self._descendants_cache.pop(node_id, None)
+            node = self._nodes.get(node_id)
+            node_id = node.parent_id if node else None
 
     def remove_branch(self, branch_root_id: str) -> list[MessageNode]:
         """
@@ -435,13 +550,17 @@ class MessageTree:
             return []
 
         parent = self.get_parent(branch_root_id)
+        branch_ids = self.get_descendants(branch_root_id)
+        self._invalidate_descendants(branch_root_id)
         removed = []
-        for nid in self.get_descendants(branch_root_id):
+        for nid in branch_ids:
             node = self._nodes.get(nid)
             if node:
                 removed.append(node)
                 del self._nodes[nid]
                 del self._status_to_node[node.status_message_id]
+                self._active_ids.discard(nid)
+                self._descendants_cache.pop(nid, None)
 
         if parent and branch_root_id in parent.children_ids:
             parent.children_ids = [
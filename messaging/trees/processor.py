@@ -67,7 +67,7 @@ class TreeQueueProcessor:
     ) -> None:
         """Process a single node and then check the queue."""
         # Skip if already in terminal state (e.g. from error propagation)
-        if node.state.value == MessageState.ERROR.value:
+        if node.state is MessageState.ERROR:
             logger.info(
                 f"Skipping node {node.node_id} as it is already in state {node.state}"
             )
@@ -116,6 +116,12 @@ class TreeQueueProcessor:
                     asyncio.create_task(self.process_node(tree, node, processor))
                 )
 
+        # A node that already failed (e.g. via error propagation) is skipped by
+        # process_node, which dequeues again right away; that pass notifies.
+        # Coalescing here turns a run of skipped nodes into one queue refresh.
+        if node is not None and node.state is MessageState.ERROR:
+            return
+
         # Notify that this node has started processing and refresh queue positions.
         if next_node_id:
             await self._notify_node_started(tree, next_node_id)
@@ -138,22 +144,34 @@ class TreeQueueProcessor:
         Returns:
             True if queued, False if processing immediately
         """
+        # Idle tree and nobody inside a locked section: nothing can interleave
+        # before the next await, so start without the lock round-trip.
+        if not tree.is_processing and not tree.is_locked():
+            self._start_node(tree, node_id, processor)
+            return False
+
         async with tree.with_lock():
             if tree.is_processing:
                 tree.put_queue_unlocked(node_id)
                 queue_size = tree.get_queue_size()
                 logger.info(f"Queued node {node_id}, position {queue_size}")
                 return True
-            else:
-                tree.set_processing_state(node_id, True)
-
-                # Process outside the lock
-                node = tree.get_node(node_id)
-                if node:
-                    tree.set_current_task(
-                        asyncio.create_task(self.process_node(tree, node, processor))
-                    )
-                return False
+            self._start_node(tree, node_id, processor)
+            return False
+
+    def _start_node(
+        self,
+        tree: MessageTree,
+        node_id: str,
+        processor: Callable[[str, MessageNode], Awaitable[None]],
+    ) -> None:
+        """Mark the tree busy and spawn the node's task. Must not be interleaved."""
+        tree.set_processing_state(node_id, True)
+        node = tree.get_node(node_id)
+        if node:
+            tree.set_current_task(
+                asyncio.create_task(self.process_node(tree, node, processor))
+            )
 
     def cancel_current(self, tree: MessageTree) -> bool:
         """Cancel the currently running task in a tree."""
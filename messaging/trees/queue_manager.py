@@ -11,7 +11,7 @@ from datetime import UTC, datetime
 from loguru import logger
 
 from ..models import IncomingMessage
-from .data import MessageNode, MessageState, MessageTree
+from .data import TERMINAL_STATES, MessageNode, MessageState, MessageTree
 from .processor import TreeQueueProcessor
 from .repository import TreeRepository
 
@@ -47,6 +47,8 @@ class TreeQueueManager:
             queue_update_callback=queue_update_callback,
             node_started_callback=node_started_callback,
         )
+        # Guards repository index mutations and cross-tree operations only;
+        # work inside a single tree is serialized by that tree's own lock.
         self._lock = asyncio.Lock()
 
         logger.info("TreeQueueManager initialized")
@@ -68,19 +70,19 @@ class TreeQueueManager:
         Returns:
             The created MessageTree
         """
-        async with self._lock:
-            root_node = MessageNode(
-                node_id=node_id,
-                incoming=incoming,
-                status_message_id=status_message_id,
-                state=MessageState.PENDING,
-            )
+        root_node = MessageNode(
+            node_id=node_id,
+            incoming=incoming,
+            status_message_id=status_message_id,
+            state=MessageState.PENDING,
+        )
+        tree = MessageTree(root_node)
 
-            tree = MessageTree(root_node)
+        async with self._lock:
             self._repository.add_tree(node_id, tree)
 
-            logger.info(f"Created new tree with root {node_id}")
-            return tree
+        logger.info(f"Created new tree with root {node_id}")
+        return tree
 
     async def add_to_tree(
         self,
@@ -101,24 +103,19 @@ class TreeQueueManager:
         Returns:
             Tuple of (tree, new_node)
         """
-        async with self._lock:
-            if not self._repository.has_node(parent_node_id):
-                raise ValueError(f"Parent node {parent_node_id} not found in any tree")
-
-            tree = self._repository.get_tree_for_node(parent_node_id)
-            if not tree:
-                raise ValueError(f"Parent node {parent_node_id} not found in any tree")
+        # Plain dict reads and a single-key write; no await between them, so
+        # the manager lock is not needed. The tree serializes add_node itself.
+        tree = self._repository.get_tree_for_node(parent_node_id)
+        if not tree:
+            raise ValueError(f"Parent node {parent_node_id} not found in any tree")
 
-        # Add node (tree has its own lock) - outside manager lock to avoid deadlock
         node = await tree.add_node(
             node_id=node_id,
             incoming=incoming,
             status_message_id=status_message_id,
             parent_id=parent_node_id,
         )
-
-        async with self._lock:
-            self._repository.register_node(node_id, tree.root_id)
+        self._repository.register_node(node_id, tree.root_id)
 
         logger.info(f"Added node {node_id} to tree {tree.root_id}")
         return tree, node
@@ -211,13 +208,14 @@ class TreeQueueManager:
 
         if propagate_to_children:
             pending_children = self._repository.get_pending_children(node_id)
-            for child in pending_children:
-                await tree.update_state(
-                    child.node_id,
-                    MessageState.ERROR,
-                    error_message=f"Parent failed: {error_message}",
+            if pending_children:
+                affected.extend(
+                    await tree.update_states_bulk(
+                        [child.node_id for child in pending_children],
+                        MessageState.ERROR,
+                        error_message=f"Parent failed: {error_message}",
+                    )
                 )
-                affected.append(child)
 
         return affected
 
@@ -239,10 +237,7 @@ class TreeQueueManager:
             current_id = tree.current_node_id
             if current_id:
                 node = tree.get_node(current_id)
-                if node and node.state not in (
-                    MessageState.COMPLETED,
-                    MessageState.ERROR,
-                ):
+                if node and node.state not in TERMINAL_STATES:
                     node.state = MessageState.ERROR
                     node.error_message = "Cancelled by user"
                     cancelled_nodes.append(node)
@@ -250,18 +245,9 @@ class TreeQueueManager:
         # 2. Drain queue and mark nodes as cancelled
         queue_nodes = tree.drain_queue_and_mark_cancelled()
         cancelled_nodes.extend(queue_nodes)
-        cancelled_ids = {n.node_id for n in cancelled_nodes}
 
         # 3. Cleanup: Mark ANY other PENDING or IN_PROGRESS nodes as ERROR
-        cleanup_count = 0
-        for node in tree.all_nodes():
-            if (
-                node.state in (MessageState.PENDING, MessageState.IN_PROGRESS)
-                and node.node_id not in cancelled_ids
-            ):
-                node.state = MessageState.ERROR
-                node.error_message = "Stale task cleaned up"
-                cleanup_count += 1
+        cleanup_count = len(tree.fail_active_nodes("Stale task cleaned up"))
 
         tree.reset_processing_state()
 
@@ -294,7 +280,7 @@ class TreeQueueManager:
             if not node:
                 return []
 
-            if node.state in (MessageState.COMPLETED, MessageState.ERROR):
+            if node.state in TERMINAL_STATES:
                 return []
 
             if tree.is_current_node(node_id):
@@ -324,7 +310,8 @@ class TreeQueueManager:
         NOTE: Must be called with self._lock held.
         """
         all_cancelled = []
-        for root_id in list(self._repository.tree_ids()):
+        # tree_ids() is already a snapshot, so cancel_tree may not mutate it.
+        for root_id in self._repository.tree_ids():
             all_cancelled.extend(self.cancel_tree(root_id))
         return all_cancelled
 
@@ -335,11 +322,7 @@ class TreeQueueManager:
         """
         count = 0
         for tree in self._repository.all_trees():
-            for node in tree.all_nodes():
-                if node.state in (MessageState.PENDING, MessageState.IN_PROGRESS):
-                    node.state = MessageState.ERROR
-                    node.error_message = "Lost during server restart"
-                    count += 1
+            count += len(tree.fail_active_nodes("Lost during server restart"))
         if count:
             logger.info(f"Cleaned up {count} stale nodes during startup")
         return count
@@ -382,24 +365,20 @@ class TreeQueueManager:
         async with tree.with_lock():
             for nid in branch_ids:
                 node = tree.get_node(nid)
-                if not node or node.state in (
-                    MessageState.COMPLETED,
-                    MessageState.ERROR,
-                ):
+                if not node or node.state in TERMINAL_STATES:
                     continue
 
                 if tree.is_current_node(nid):
                     self._processor.cancel_current(tree)
-                    node.state = MessageState.ERROR
-                    node.error_message = "Cancelled by user"
-                    node.completed_at = datetime.now(UTC)
-                    cancelled.append(node)
-                else:
-                    tree.remove_from_queue(nid)
-                    node.state = MessageState.ERROR
-                    node.error_message = "Cancelled by user"
-                    node.completed_at = datetime.now(UTC)
-                    cancelled.append(node)
+                cancelled.append(node)
+
+            # One pass over the queue instead of one per cancelled node.
+            tree.remove_many_from_queue({node.node_id for node in cancelled})
+            completed_at = datetime.now(UTC)
+            for node in cancelled:
+                node.state = MessageState.ERROR
+                node.error_message = "Cancelled by user"
+                node.completed_at = completed_at
 
         if cancelled:
             logger.info(f"Cancelled {len(cancelled)} nodes in branch {branch_root_id}")
@@ -432,7 +411,7 @@ class TreeQueueManager:
         async with tree.with_lock():
             removed = tree.remove_branch(branch_root_id)
 
-        self._repository.unregister_nodes([n.node_id for n in removed])
+        self._repository.unregister_branch(removed)
         return (removed, root_id, False)
 
     def to_dict(self) -> dict:
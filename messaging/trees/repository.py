@@ -3,6 +3,8 @@
 Provides data access layer for managing trees and node mappings.
 """
 
+from collections import deque
+
 from loguru import logger
 
 from .data import MessageNode, MessageState, MessageTree
@@ -17,7 +19,8 @@ class TreeRepository:
 
     def __init__(self):
         self._trees: dict[str, MessageTree] = {}  # root_id -> tree
-        self._node_to_tree: dict[str, str] = {}  # node_id -> root_id
+        # node_id -> tree; holds the tree itself so lookups are a single get
+        self._node_to_tree: dict[str, MessageTree] = {}
 
     def get_tree(self, root_id: str) -> MessageTree | None:
         """Get a tree by its root ID."""
@@ -25,10 +28,7 @@ class TreeRepository:
 
     def get_tree_for_node(self, node_id: str) -> MessageTree | None:
         """Get the tree containing a given node."""
-        root_id = self._node_to_tree.get(node_id)
-        if not root_id:
-            return None
-        return self._trees.get(root_id)
+        return self._node_to_tree.get(node_id)
 
     def get_node(self, node_id: str) -> MessageNode | None:
         """Get a node from any tree."""
@@ -38,12 +38,15 @@ class TreeRepository:
     def add_tree(self, root_id: str, tree: MessageTree) -> None:
         """Add a new tree to the repository."""
         self._trees[root_id] = tree
-        self._node_to_tree[root_id] = root_id
+        self._node_to_tree[root_id] = tree
         logger.debug("TREE_REPO: add_tree root_id=%s", root_id)
 
     def register_node(self, node_id: str, root_id: str) -> None:
-        """Register a node ID to a tree."""
-        self._node_to_tree[node_id] = root_id
+        """Register a node ID to a tree. Unknown root IDs are ignored."""
+        tree = self._trees.get(root_id)
+        if tree is None:
+            return
+        self._node_to_tree[node_id] = tree
         logger.debug("TREE_REPO: register_node node_id=%s root_id=%s", node_id, root_id)
 
     def has_node(self, node_id: str) -> bool:
@@ -74,7 +77,8 @@ class TreeRepository:
         Resolve a message ID to the actual parent node ID.
 
         Handles the case where msg_id is a status message ID
-        (which maps to the tree but isn't an actual node).
+        (which maps to the tree but isn't an actual node). Both checks are
+        dict lookups; the tree keeps its own status-message index.
 
         Returns:
             The node_id to use as parent, or None if not found
@@ -102,20 +106,23 @@ class TreeRepository:
         children should also be marked as failed.
         """
         tree = self.get_tree_for_node(node_id)
-        if not tree:
+        if not tree or not tree.has_node(node_id):
             return []
 
-        pending = []
-        node = tree.get_node(node_id)
-        if not node:
-            return []
-
-        for child_id in node.children_ids:
-            child = tree.get_node(child_id)
-            if child and child.state == MessageState.PENDING:
-                pending.append(child)
-                # Recursively get children of pending children
-                pending.extend(self.get_pending_children(child_id))
+        # Iterative BFS: no recursion limit on deep trees, no per-level
+        # repository lookup.
+        get = tree.get_node
+        pending: list[MessageNode] = []
+        frontier = deque([node_id])
+        while frontier:
+            node = get(frontier.popleft())
+            if not node:
+                continue
+            for child_id in node.children_ids:
+                child = get(child_id)
+                if child and child.state == MessageState.PENDING:
+                    pending.append(child)
+                    frontier.append(child_id)
 
         return pending
 
@@ -132,6 +139,12 @@ class TreeRepository:
         for nid in node_ids:
             self._node_to_tree.pop(nid, None)
 
+    def unregister_branch(self, nodes: list[MessageNode]) -> None:
+        """Remove removed nodes and their status message IDs from the mapping."""
+        for node in nodes:
+            self._node_to_tree.pop(node.node_id, None)
+            self._node_to_tree.pop(node.status_message_id, None)
+
     def remove_tree(self, root_id: str) -> MessageTree | None:
         """
         Remove a tree and all its node mappings from the repository.
@@ -142,8 +155,7 @@ class TreeRepository:
         tree = self._trees.pop(root_id, None)
         if not tree:
             return None
-        for node in tree.all_nodes():
-            self._node_to_tree.pop(node.node_id, None)
+        self.unregister_branch(tree.all_nodes())
         logger.debug("TREE_REPO: remove_tree root_id=%s", root_id)
         return tree
 
@@ -151,7 +163,9 @@ class TreeRepository:
         """Serialize all trees."""
         return {
             "trees": {rid: tree.to_dict() for rid, tree in self._trees.items()},
-            "node_to_tree": self._node_to_tree.copy(),
+            "node_to_tree": {
+                nid: tree.root_id for nid, tree in self._node_to_tree.items()
+            },
         }
 
     @classmethod
@@ -160,7 +174,13 @@ class TreeRepository:
         from .data import MessageTree
 
         repo = cls()
+        trees = repo._trees
         for root_id, tree_data in data.get("trees", {}).items():
-            repo._trees[root_id] = MessageTree.from_dict(tree_data)
-        repo._node_to_tree = data.get("node_to_tree", {})
+            trees[root_id] = MessageTree.from_dict(tree_data)
+        # Built in one pass rather than via register_node, which logs per node.
+        repo._node_to_tree = {
+            node_id: trees[root_id]
+            for node_id, root_id in data.get("node_to_tree", {}).items()
+            if root_id in trees
+        }
         return repo
@@ -26,6 +26,10 @@ class ProviderConfig(BaseModel):
 class BaseProvider(ABC):
     """Base class for all providers. Extend this to add your own."""
 
+    # Built-in providers declare their attributes so instances carry no
+    # __dict__; subclasses that omit __slots__ still get one as usual.
+    __slots__ = ("config",)
+
     def __init__(self, config: ProviderConfig):
         self.config = config
 
@@ -1,5 +1,7 @@
 """Error mapping for OpenAI-compatible providers (NIM, OpenRouter, LM Studio)."""
 
+from collections.abc import Callable
+
 import openai
 
 from providers.exceptions import (
@@ -12,24 +14,62 @@ from providers.exceptions import (
 from providers.rate_limit import GlobalRateLimiter
 
 
+def _map_authentication(e: Exception, message: str) -> Exception:
+    return AuthenticationError(message, raw_error=message)
+
+
+def _map_rate_limit(e: Exception, message: str) -> Exception:
+    # Trigger global rate limit block
+    GlobalRateLimiter.get_instance().set_blocked(60)  # Default 60s cooldown
+    return RateLimitError(message, raw_error=message)
+
+
+def _map_bad_request(e: Exception, message: str) -> Exception:
+    return InvalidRequestError(message, raw_error=message)
+
+
+def _map_internal_server(e: Exception, message: str) -> Exception:
+    lowered = message.lower()
+    if "overloaded" in lowered or "capacity" in lowered:
+        return OverloadedError(message, raw_error=message)
+    return APIError(message, status_code=500, raw_error=message)
+
+
+def _map_api_error(e: Exception, message: str) -> Exception:
+    return APIError(
+        message, status_code=getattr(e, "status_code", 500), raw_error=message
+    )
+
+
+# Mappers receive the exception and its str(), formatted once by map_error.
+_ErrorMapper = Callable[[Exception, str], Exception]
+
+_ERROR_MAPPERS: dict[type, _ErrorMapper] = {
+    openai.AuthenticationError: _map_authentication,
+    openai.RateLimitError: _map_rate_limit,
+    openai.BadRequestError: _map_bad_request,
+    openai.InternalServerError: _map_internal_server,
+    openai.APIError: _map_api_error,
+}
+# Concrete exception type -> mapper (None for unmapped), filled on first sight.
+_MAPPER_BY_TYPE: dict[type, _ErrorMapper | None] = {}
+
+
+def _mapper_for(exc_type: type) -> _ErrorMapper | None:
+    """Resolve the most specific mapper along the MRO, as isinstance order would."""
+    try:
+        return _MAPPER_BY_TYPE[exc_type]
+    except KeyError:
+        pass
+    mapper = next(
+        (_ERROR_MAPPERS[cls] for cls in exc_type.__mro__ if cls in _ERROR_MAPPERS),
+        None,
+    )
+    _MAPPER_BY_TYPE[exc_type] = mapper
+    return mapper
+
+
 def map_error(e: Exception) -> Exception:
     """Map OpenAI exception to specific ProviderError."""
-    if isinstance(e, openai.AuthenticationError):
-        return AuthenticationError(str(e), raw_error=str(e))
-    if isinstance(e, openai.RateLimitError):
-        # Trigger global rate limit block
-        GlobalRateLimiter.get_instance().set_blocked(60)  # Default 60s cooldown
-        return RateLimitError(str(e), raw_error=str(e))
-    if isinstance(e, openai.BadRequestError):
-        return InvalidRequestError(str(e), raw_error=str(e))
-    if isinstance(e, openai.InternalServerError):
-        message = str(e)
-        if "overloaded" in message.lower() or "capacity" in message.lower():
-            return OverloadedError(message, raw_error=str(e))
-        return APIError(message, status_code=500, raw_error=str(e))
-    if isinstance(e, openai.APIError):
-        return APIError(
-            str(e), status_code=getattr(e, "status_code", 500), raw_error=str(e)
-        )
-
-    return e
+    mapper = _mapper_for(type(e))
+    return mapper(e, str(e)) if mapper else e
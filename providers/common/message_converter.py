@@ -3,11 +3,18 @@
 import json
 from typing import Any
 
+_MISSING = object()
+
 
 def get_block_attr(block: Any, attr: str, default: Any = None) -> Any:
     """Get attribute from object or dict."""
-    if hasattr(block, attr):
-        return getattr(block, attr)
+    # Plain dicts (raw JSON payloads) are dispatched on their exact type first;
+    # objects need one getattr probe rather than hasattr followed by getattr.
+    if type(block) is dict:
+        return block.get(attr, default)
+    value = getattr(block, attr, _MISSING)
+    if value is not _MISSING:
+        return value
     if isinstance(block, dict):
         return block.get(attr, default)
     return default
@@ -132,9 +139,10 @@ class AnthropicToOpenAIConverter:
                 flush_text()
                 tool_content = get_block_attr(block, "content", "")
                 if isinstance(tool_content, list):
+                    # Only stringify items that have no text of their own.
                     tool_content = "\n".join(
-                        item.get("text", str(item))
-                        if isinstance(item, dict)
+                        item["text"]
+                        if isinstance(item, dict) and "text" in item
                         else str(item)
                         for item in tool_content
                     )
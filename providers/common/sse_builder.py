@@ -5,18 +5,19 @@ from collections.abc import Iterator
 from dataclasses import dataclass, field
 from typing import Any
 
+import orjson
 from loguru import logger
 
 try:
-    import tiktoken
+    from utils.tokens import get_encoder
 
-    ENCODER = tiktoken.get_encoding("cl100k_base")
+    ENCODER = get_encoder()
 except Exception:
     ENCODER = None
 
 
 # Map OpenAI finish_reason to Anthropic stop_reason
-STOP_REASON_MAP = {
+STOP_REASON_MAP: dict[str | None, str] = {
     "stop": "end_turn",
     "length": "max_tokens",
     "tool_calls": "tool_use",
@@ -24,11 +25,22 @@ STOP_REASON_MAP = {
 }
 
 
+def _parse_tool_args(buf: str) -> Any:
+    """Parse tool-call argument JSON, unwrapping one level of double encoding.
+
+    Task args are re-parsed on every streamed fragment until they form valid
+    JSON, so the fast C parser matters most on the failing path.
+    """
+    value = orjson.loads(buf)
+    if isinstance(value, str):
+        value = orjson.loads(value)
+    return value
+
+
 def map_stop_reason(openai_reason: str | None) -> str:
     """Map OpenAI finish_reason to Anthropic stop_reason."""
-    return (
-        STOP_REASON_MAP.get(openai_reason, "end_turn") if openai_reason else "end_turn"
-    )
+    # None and "" are not keys, so they fall through to the default.
+    return STOP_REASON_MAP.get(openai_reason, "end_turn")
 
 
 @dataclass
@@ -85,8 +97,10 @@ class ContentBlockManager:
         buf = self.task_arg_buffer.get(index, "") + args
         self.task_arg_buffer[index] = buf
         try:
-            args_json = json.loads(buf)
-        except Exception:
+            args_json = _parse_tool_args(buf)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(args_json, dict):
             return None
 
         if args_json.get("run_in_background") is not False:
@@ -106,7 +120,7 @@ class ContentBlockManager:
 
             out = "{}"
             try:
-                args_json = json.loads(buf)
+                args_json = _parse_tool_args(buf)
                 if args_json.get("run_in_background") is not False:
                     args_json["run_in_background"] = False
                 out = json.dumps(args_json)
@@ -140,7 +154,11 @@ class SSEBuilder:
     def _format_event(self, event_type: str, data: dict[str, Any]) -> str:
         """Format as SSE string."""
         event_str = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-        logger.debug(f"SSE_EVENT: {event_type} - {event_str.strip()}")
+        # Every streamed delta passes through here; build the log line only
+        # when debug logging is actually enabled.
+        logger.opt(lazy=True).debug(
+            "SSE_EVENT: {} - {}", lambda: event_type, lambda: event_str.strip()
+        )
         return event_str
 
     # Message lifecycle events
@@ -13,11 +13,14 @@ LMSTUDIO_DEFAULT_BASE_URL = "http://localhost:1234/v1"
 class LMStudioProvider(OpenAICompatibleProvider):
     """LM Studio provider using OpenAI-compatible local API."""
 
+    __slots__ = ()
+
+    default_base_url = LMSTUDIO_DEFAULT_BASE_URL
+
     def __init__(self, config: ProviderConfig):
         super().__init__(
             config,
             provider_name="LMSTUDIO",
-            base_url=config.base_url or LMSTUDIO_DEFAULT_BASE_URL,
             api_key=config.api_key or "lm-studio",
         )
 
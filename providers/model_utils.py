@@ -4,6 +4,7 @@ Centralizes model name mapping logic to avoid duplication across the codebase.
 """
 
 import os
+from functools import lru_cache
 
 # Provider prefixes to strip from model names
 _PROVIDER_PREFIXES = ["anthropic/", "openai/", "gemini/"]
@@ -57,14 +58,20 @@ def normalize_model_name(model: str, default_model: str | None = None) -> str:
     Returns:
         Normalized model name (original if not a Claude model, mapped if Claude)
     """
+    if default_model is None:
+        # Use environment/config default
+        default_model = os.getenv("MODEL", "moonshotai/kimi-k2-thinking")
+    return _normalize_cached(model, default_model)
+
+
+@lru_cache(maxsize=256)
+def _normalize_cached(model: str, default_model: str) -> str:
+    """Pure, memoized core of normalize_model_name (inputs are a small set)."""
     # Strip provider prefixes
     clean = strip_provider_prefixes(model)
 
     # Map Claude models to default
     if is_claude_model(clean):
-        if default_model is None:
-            # Use environment/config default
-            default_model = os.getenv("MODEL", "moonshotai/kimi-k2-thinking")
         return default_model
 
     return model
@@ -8,15 +8,20 @@ from providers.openai_compat import OpenAICompatibleProvider
 
 from .request import build_request_body
 
+NVIDIA_NIM_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
 
 class NvidiaNimProvider(OpenAICompatibleProvider):
     """NVIDIA NIM provider using official OpenAI client."""
 
+    __slots__ = ()
+
+    default_base_url = NVIDIA_NIM_BASE_URL
+
     def __init__(self, config: ProviderConfig, *, nim_settings: NimSettings):
         super().__init__(
             config,
             provider_name="NIM",
-            base_url=config.base_url or "https://integrate.api.nvidia.com/v1",
             api_key=config.api_key,
             nim_settings=nim_settings,
         )
@@ -1,5 +1,7 @@
 """Request builder for NVIDIA NIM provider."""
 
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any
 
 from loguru import logger
@@ -7,6 +9,47 @@ from loguru import logger
 from config.nim import NimSettings
 from providers.common.message_converter import AnthropicToOpenAIConverter
 
+# Thinking/reasoning defaults; request-supplied extra_body keys override them.
+# The nested dicts are shared between request bodies and must not be mutated.
+_THINKING_DEFAULTS: dict[str, Any] = {
+    "thinking": {"type": "enabled"},
+    "reasoning_split": True,
+    "chat_template_kwargs": {
+        "thinking": True,
+        "enable_thinking": True,
+        "reasoning_split": True,
+        "clear_thinking": False,
+    },
+}
+
+
+_REQUEST_FIELDS = (
+    "model",
+    "messages",
+    "system",
+    "max_tokens",
+    "temperature",
+    "top_p",
+    "stop_sequences",
+    "tools",
+    "tool_choice",
+    "extra_body",
+    "top_k",
+)
+_get_request_fields = attrgetter(*_REQUEST_FIELDS)
+
+
+def _request_fields(request_data: Any) -> tuple[Any, ...]:
+    """Read every request field build_request_body needs in one call.
+
+    MessagesRequest always has all of them; duck-typed requests may omit the
+    optional ones, which then read as None.
+    """
+    try:
+        return _get_request_fields(request_data)
+    except AttributeError:
+        return tuple(getattr(request_data, name, None) for name in _REQUEST_FIELDS)
+
 
 def _set_if_not_none(body: dict[str, Any], key: str, value: Any) -> None:
     if value is not None:
@@ -25,99 +68,112 @@ def _set_extra(
     extra_body[key] = value
 
 
+@lru_cache(maxsize=8)
+def _static_params(nim: NimSettings) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Top-level and extra_body params that depend only on the NIM settings.
+
+    NimSettings is frozen, so these are resolved once per settings instance
+    instead of re-checking every field on each request. Values are scalars and
+    safe to share between request bodies.
+    """
+    top_level: dict[str, Any] = {}
+    if nim.presence_penalty != 0.0:
+        top_level["presence_penalty"] = nim.presence_penalty
+    if nim.frequency_penalty != 0.0:
+        top_level["frequency_penalty"] = nim.frequency_penalty
+    if nim.seed is not None:
+        top_level["seed"] = nim.seed
+    top_level["parallel_tool_calls"] = nim.parallel_tool_calls
+
+    extra: dict[str, Any] = {}
+    _set_extra(extra, "min_p", nim.min_p, ignore_value=0.0)
+    _set_extra(extra, "repetition_penalty", nim.repetition_penalty, ignore_value=1.0)
+    _set_extra(extra, "min_tokens", nim.min_tokens, ignore_value=0)
+    _set_extra(extra, "chat_template", nim.chat_template)
+    _set_extra(extra, "request_id", nim.request_id)
+    _set_extra(extra, "return_tokens_as_token_ids", nim.return_tokens_as_token_ids)
+    _set_extra(extra, "include_stop_str_in_output", nim.include_stop_str_in_output)
+    _set_extra(extra, "ignore_eos", nim.ignore_eos)
+    _set_extra(extra, "reasoning_effort", nim.reasoning_effort)
+    _set_extra(extra, "include_reasoning", nim.include_reasoning)
+    return top_level, extra
+
+
 def build_request_body(request_data: Any, nim: NimSettings) -> dict:
     """Build OpenAI-format request body from Anthropic request."""
+    (
+        model,
+        req_messages,
+        system,
+        max_tokens,
+        req_temperature,
+        req_top_p,
+        stop_sequences,
+        tools,
+        tool_choice,
+        request_extra,
+        req_top_k,
+    ) = _request_fields(request_data)
     logger.debug(
         "NIM_REQUEST: conversion start model=%s msgs=%d",
-        getattr(request_data, "model", "?"),
-        len(getattr(request_data, "messages", [])),
+        model,
+        len(req_messages),
     )
-    messages = AnthropicToOpenAIConverter.convert_messages(request_data.messages)
+    messages = AnthropicToOpenAIConverter.convert_messages(req_messages)
 
     # Add system prompt
-    system = getattr(request_data, "system", None)
     if system:
         system_msg = AnthropicToOpenAIConverter.convert_system_prompt(system)
         if system_msg:
             messages.insert(0, system_msg)
 
     body: dict[str, Any] = {
-        "model": request_data.model,
+        "model": model,
         "messages": messages,
     }
 
     # max_tokens with optional cap
-    max_tokens = getattr(request_data, "max_tokens", None)
     if max_tokens is None:
         max_tokens = nim.max_tokens
     elif nim.max_tokens:
         max_tokens = min(max_tokens, nim.max_tokens)
     _set_if_not_none(body, "max_tokens", max_tokens)
 
-    req_temperature = getattr(request_data, "temperature", None)
     temperature = req_temperature if req_temperature is not None else nim.temperature
     _set_if_not_none(body, "temperature", temperature)
 
-    req_top_p = getattr(request_data, "top_p", None)
     top_p = req_top_p if req_top_p is not None else nim.top_p
     _set_if_not_none(body, "top_p", top_p)
 
-    stop_sequences = getattr(request_data, "stop_sequences", None)
     if stop_sequences:
         body["stop"] = stop_sequences
     elif nim.stop:
         body["stop"] = nim.stop
 
-    tools = getattr(request_data, "tools", None)
     if tools:
         body["tools"] = AnthropicToOpenAIConverter.convert_tools(tools)
-    tool_choice = getattr(request_data, "tool_choice", None)
     if tool_choice:
-        body["tool_choice"] = AnthropicToOpenAIConverter.convert_tool_choice(tool_choice)
-
-    if nim.presence_penalty != 0.0:
-        body["presence_penalty"] = nim.presence_penalty
-    if nim.frequency_penalty != 0.0:
-        body["frequency_penalty"] = nim.frequency_penalty
-    if nim.seed is not None:
-        body["seed"] = nim.seed
-
-    body["parallel_tool_calls"] = nim.parallel_tool_calls
-
-    # Handle non-standard parameters via extra_body
-    extra_body: dict[str, Any] = {}
-    request_extra = getattr(request_data, "extra_body", None)
-    if request_extra:
-        extra_body.update(request_extra)
-
-    # Handle thinking/reasoning mode
-    extra_body.setdefault("thinking", {"type": "enabled"})
-    extra_body.setdefault("reasoning_split", True)
-    extra_body.setdefault(
-        "chat_template_kwargs",
-        {
-            "thinking": True,
-            "enable_thinking": True,
-            "reasoning_split": True,
-            "clear_thinking": False,
-        },
+        body["tool_choice"] = AnthropicToOpenAIConverter.convert_tool_choice(
+            tool_choice
+        )
+
+    static_top_level, static_extra = _static_params(nim)
+    body.update(static_top_level)
+
+    # Handle non-standard parameters via extra_body, on top of the
+    # thinking/reasoning defaults
+    extra_body: dict[str, Any] = (
+        {**_THINKING_DEFAULTS, **request_extra}
+        if request_extra
+        else _THINKING_DEFAULTS.copy()
     )
 
-    req_top_k = getattr(request_data, "top_k", None)
     top_k = req_top_k if req_top_k is not None else nim.top_k
     _set_extra(extra_body, "top_k", top_k, ignore_value=-1)
-    _set_extra(extra_body, "min_p", nim.min_p, ignore_value=0.0)
-    _set_extra(
-        extra_body, "repetition_penalty", nim.repetition_penalty, ignore_value=1.0
-    )
-    _set_extra(extra_body, "min_tokens", nim.min_tokens, ignore_value=0)
-    _set_extra(extra_body, "chat_template", nim.chat_template)
-    _set_extra(extra_body, "request_id", nim.request_id)
-    _set_extra(extra_body, "return_tokens_as_token_ids", nim.return_tokens_as_token_ids)
-    _set_extra(extra_body, "include_stop_str_in_output", nim.include_stop_str_in_output)
-    _set_extra(extra_body, "ignore_eos", nim.ignore_eos)
-    _set_extra(extra_body, "reasoning_effort", nim.reasoning_effort)
-    _set_extra(extra_body, "include_reasoning", nim.include_reasoning)
+    # Request-supplied extra_body keys win over the settings defaults.
+    for key, value in static_extra.items():
+        if key not in extra_body:
+            extra_body[key] = value
 
     if extra_body:
         body["extra_body"] = extra_body
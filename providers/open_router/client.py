@@ -15,11 +15,14 @@ OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 class OpenRouterProvider(OpenAICompatibleProvider):
     """OpenRouter provider using OpenAI-compatible API."""
 
+    __slots__ = ()
+
+    default_base_url = OPENROUTER_BASE_URL
+
     def __init__(self, config: ProviderConfig):
         super().__init__(
             config,
             provider_name="OPENROUTER",
-            base_url=config.base_url or OPENROUTER_BASE_URL,
             api_key=config.api_key,
         )
 
@@ -30,9 +33,14 @@ class OpenRouterProvider(OpenAICompatibleProvider):
     def _handle_extra_reasoning(self, delta: Any, sse: SSEBuilder) -> Iterator[str]:
         """Handle reasoning_details for StepFun models."""
         reasoning_details = getattr(delta, "reasoning_details", None)
-        if reasoning_details and isinstance(reasoning_details, list):
-            for item in reasoning_details:
-                text = item.get("text", "") if isinstance(item, dict) else ""
-                if text:
-                    yield from sse.ensure_thinking_block()
-                    yield sse.emit_thinking_delta(text)
+        if not reasoning_details or not isinstance(reasoning_details, list):
+            return
+        # Collect in one pass and emit a single delta rather than one per item.
+        texts = [
+            text
+            for item in reasoning_details
+            if isinstance(item, dict) and (text := item.get("text"))
+        ]
+        if texts:
+            yield from sse.ensure_thinking_block()
+            yield sse.emit_thinking_delta("".join(texts))
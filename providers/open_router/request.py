@@ -52,20 +52,19 @@ def build_request_body(request_data: Any) -> dict:
         body["tools"] = AnthropicToOpenAIConverter.convert_tools(tools)
     tool_choice = getattr(request_data, "tool_choice", None)
     if tool_choice:
-        body["tool_choice"] = AnthropicToOpenAIConverter.convert_tool_choice(tool_choice)
+        body["tool_choice"] = AnthropicToOpenAIConverter.convert_tool_choice(
+            tool_choice
+        )
 
     # OpenRouter reasoning: extra_body={"reasoning": {"enabled": True}}
-    extra_body: dict[str, Any] = {}
-    request_extra = getattr(request_data, "extra_body", None)
-    if request_extra:
-        extra_body.update(request_extra)
+    # The request's extra_body is only read downstream, so it is passed through
+    # as-is and copied only when reasoning has to be added to it.
+    extra_body: dict[str, Any] = getattr(request_data, "extra_body", None) or {}
 
+    # ThinkingConfig always defines `enabled` (default True); no probe needed.
     thinking = getattr(request_data, "thinking", None)
-    thinking_enabled = (
-        thinking.enabled if thinking and hasattr(thinking, "enabled") else True
-    )
-    if thinking_enabled:
-        extra_body.setdefault("reasoning", {"enabled": True})
+    if (thinking is None or thinking.enabled) and "reasoning" not in extra_body:
+        extra_body = {**extra_body, "reasoning": {"enabled": True}}
 
     if extra_body:
         body["extra_body"] = extra_body
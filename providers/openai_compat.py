@@ -1,9 +1,9 @@
 """Shared base class for OpenAI-compatible providers (NIM, OpenRouter, LM Studio)."""
 
 import json
-import uuid
 from collections.abc import AsyncIterator, Iterator
 from typing import Any
+from uuid import uuid4
 
 import httpx
 from loguru import logger
@@ -24,19 +24,34 @@ from providers.rate_limit import GlobalRateLimiter
 class OpenAICompatibleProvider(BaseProvider):
     """Base class for providers using OpenAI-compatible chat completions API."""
 
+    __slots__ = (
+        "_api_key",
+        "_base_url",
+        "_client",
+        "_global_rate_limiter",
+        "_nim_settings",
+        "_provider_name",
+    )
+
+    # Used when neither the constructor nor the config supplies a base_url.
+    default_base_url: str | None = None
+
     def __init__(
         self,
         config: ProviderConfig,
         *,
         provider_name: str,
-        base_url: str,
         api_key: str,
+        base_url: str | None = None,
         nim_settings: Any | None = None,
         default_query: dict[str, str] | None = None,
     ):
         super().__init__(config)
         self._provider_name = provider_name
         self._api_key = api_key
+        base_url = base_url or config.base_url or self.default_base_url
+        if not base_url:
+            raise ValueError(f"{provider_name} provider requires a base_url")
         self._base_url = base_url.rstrip("/")
         self._nim_settings = nim_settings
         self._global_rate_limiter = GlobalRateLimiter.get_instance(
@@ -70,29 +85,30 @@ class OpenAICompatibleProvider(BaseProvider):
         if tc_index < 0:
             tc_index = len(sse.blocks.tool_indices)
 
-        fn_delta = tc.get("function", {})
+        incoming_id = tc.get("id")
+        fn_delta = tc.get("function") or {}
         incoming_name = fn_delta.get("name")
         if incoming_name is not None:
             sse.blocks.register_tool_name(tc_index, incoming_name)
 
         if tc_index not in sse.blocks.tool_indices:
             name = sse.blocks.tool_names.get(tc_index, "")
-            if name or tc.get("id"):
-                tool_id = tc.get("id") or f"tool_{uuid.uuid4()}"
+            if name or incoming_id:
+                tool_id = incoming_id or f"tool_{uuid4().hex}"
                 yield sse.start_tool_block(tc_index, tool_id, name)
                 sse.blocks.tool_started[tc_index] = True
         elif not sse.blocks.tool_started.get(tc_index) and sse.blocks.tool_names.get(
             tc_index
         ):
-            tool_id = tc.get("id") or f"tool_{uuid.uuid4()}"
+            tool_id = incoming_id or f"tool_{uuid4().hex}"
             name = sse.blocks.tool_names[tc_index]
             yield sse.start_tool_block(tc_index, tool_id, name)
             sse.blocks.tool_started[tc_index] = True
 
-        args = fn_delta.get("arguments", "")
+        args = fn_delta.get("arguments")
         if args:
             if not sse.blocks.tool_started.get(tc_index):
-                tool_id = tc.get("id") or f"tool_{uuid.uuid4()}"
+                tool_id = incoming_id or f"tool_{uuid4().hex}"
                 name = sse.blocks.tool_names.get(tc_index, "tool_call") or "tool_call"
                 yield sse.start_tool_block(tc_index, tool_id, name)
                 sse.blocks.tool_started[tc_index] = True
@@ -133,7 +149,7 @@ class OpenAICompatibleProvider(BaseProvider):
     ) -> AsyncIterator[str]:
         """Shared streaming implementation."""
         tag = self._provider_name
-        message_id = f"msg_{uuid.uuid4()}"
+        message_id = f"msg_{uuid4().hex}"
         sse = SSEBuilder(message_id, request.model, input_tokens)
 
         body = self._build_request_body(request)
@@ -234,13 +250,15 @@ class OpenAICompatibleProvider(BaseProvider):
                     for event in sse.close_content_blocks():
                         yield event
                     for tc in delta.tool_calls:
+                        # Some providers send id/index-only deltas with no
+                        # function payload.
+                        fn = tc.function
                         tc_info = {
                             "index": tc.index,
                             "id": tc.id,
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
+                            "function": {"name": fn.name, "arguments": fn.arguments}
+                            if fn is not None
+                            else {},
                         }
                         for event in self._process_tool_call(tc_info, sse):
                             yield event
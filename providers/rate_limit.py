@@ -3,7 +3,7 @@
 import asyncio
 import random
 import time
-from collections import deque
+from array import array
 from collections.abc import Callable
 from typing import Any, TypeVar
 
@@ -12,6 +12,10 @@ from loguru import logger
 
 T = TypeVar("T")
 
+_NS_PER_SEC = 1_000_000_000
+# Grant time for slots that have never been used; always outside the window.
+_NEVER_NS = -(2**63)
+
 
 class GlobalRateLimiter:
     """
@@ -25,7 +29,13 @@ class GlobalRateLimiter:
 
     _instance: GlobalRateLimiter | None = None
 
-    def __init__(self, rate_limit: int = 40, rate_window: float = 60.0):
+    def __init__(
+        self,
+        rate_limit: int = 40,
+        rate_window: float = 60.0,
+        *,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
         # Prevent double initialization in singleton
         if hasattr(self, "_initialized"):
             return
@@ -36,10 +46,15 @@ class GlobalRateLimiter:
             raise ValueError("rate_window must be > 0")
 
         self._rate_limit = rate_limit
-        self._rate_window = float(rate_window)
-        # Monotonic timestamps of the last granted slots.
-        self._request_times: deque[float] = deque()
-        self._blocked_until: float = 0
+        # All timestamps are integer nanoseconds from `clock` (monotonic_ns
+        # in production; tests inject a fake clock).
+        self._clock = clock
+        self._rate_window_ns = int(rate_window * _NS_PER_SEC)
+        # Ring of grant times for the last `rate_limit` slots; the entry at
+        # the cursor is always the oldest grant.
+        self._slot_times = array("q", [_NEVER_NS]) * rate_limit
+        self._slot_idx = 0
+        self._blocked_until_ns = 0
         self._lock = asyncio.Lock()
         self._initialized = True
 
@@ -80,9 +95,9 @@ class GlobalRateLimiter:
         """
         # 1. Reactive check: Wait if someone hit a 429
         waited_reactively = False
-        now = time.monotonic()
-        if now < self._blocked_until:
-            wait_time = self._blocked_until - now
+        wait_ns = self._blocked_until_ns - self._clock()
+        if wait_ns > 0:
+            wait_time = wait_ns / _NS_PER_SEC
             logger.warning(
                 f"Global provider rate limit active (reactive), waiting {wait_time:.1f}s..."
             )
@@ -100,27 +115,30 @@ class GlobalRateLimiter:
         Guarantees: at most `self._rate_limit` acquisitions in any interval of length
         `self._rate_window` (seconds).
         """
+        # Fast path: the slot check never awaits, so when nobody holds the
+        # lock it can run without entering the lock's async context manager.
+        if not self._lock.locked() and self._try_take_slot(self._clock()) == 0:
+            return
+
         while True:
-            wait_time = 0.0
             async with self._lock:
-                now = time.monotonic()
-                cutoff = now - self._rate_window
-
-                while self._request_times and self._request_times[0] <= cutoff:
-                    self._request_times.popleft()
-
-                if len(self._request_times) < self._rate_limit:
-                    self._request_times.append(now)
+                wait_ns = self._try_take_slot(self._clock())
+                if wait_ns == 0:
                     return
 
-                oldest = self._request_times[0]
-                wait_time = max(0.0, (oldest + self._rate_window) - now)
-
             # Sleep outside the lock so other tasks can continue to queue.
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            else:
-                await asyncio.sleep(0)
+            await asyncio.sleep(wait_ns / _NS_PER_SEC)
+
+    def _try_take_slot(self, now_ns: int) -> int:
+        """Claim a slot if one is free; otherwise return nanoseconds until one is."""
+        # A slot frees up once the oldest of the last N grants leaves the
+        # window; no per-call pruning needed.
+        ready_at = self._slot_times[self._slot_idx] + self._rate_window_ns
+        if now_ns >= ready_at:
+            self._slot_times[self._slot_idx] = now_ns
+            self._slot_idx = (self._slot_idx + 1) % self._rate_limit
+            return 0
+        return ready_at - now_ns
 
     def set_blocked(self, seconds: float = 60) -> None:
         """
@@ -129,16 +147,16 @@ class GlobalRateLimiter:
         Args:
             seconds: How long to block (default 60s)
         """
-        self._blocked_until = time.monotonic() + seconds
+        self._blocked_until_ns = self._clock() + int(seconds * _NS_PER_SEC)
         logger.warning(f"Global provider rate limit set for {seconds:.1f}s (reactive)")
 
     def is_blocked(self) -> bool:
         """Check if currently reactively blocked."""
-        return time.monotonic() < self._blocked_until
+        return self._clock() < self._blocked_until_ns
 
     def remaining_wait(self) -> float:
         """Get remaining reactive wait time in seconds."""
-        return max(0.0, self._blocked_until - time.monotonic())
+        return max(0, self._blocked_until_ns - self._clock()) / _NS_PER_SEC
 
     async def execute_with_retry(
         self,
@@ -11,11 +11,12 @@ from .request import build_request_body
 class VertexAIProvider(OpenAICompatibleProvider):
     """Vertex AI provider using OpenAI-compatible OpenAPI endpoint."""
 
+    __slots__ = ()
+
     def __init__(self, config: ProviderConfig):
         super().__init__(
             config,
             provider_name="VERTEX",
-            base_url=config.base_url,
             api_key="",  # We use default_query instead
             default_query={"key": config.api_key} if config.api_key else None,
         )
@@ -353,3 +353,61 @@ def test_app_lifespan_flush_pending_save_exception_warning_only(tmp_path):
 
     session_store.flush_pending_save.assert_called_once()
     cleanup_provider.assert_awaited_once()
+
+
+def _no_platform_settings(tmp_path):
+    return SimpleNamespace(
+        provider_type="nvidia_nim",
+        messaging_platform="telegram",
+        telegram_bot_token=None,
+        allowed_telegram_user_id=None,
+        discord_bot_token=None,
+        allowed_discord_channels=None,
+        allowed_dir="",
+        claude_workspace=str(tmp_path / "data"),
+        host="127.0.0.1",
+        port=8082,
+        max_cli_sessions=1,
+        log_file=str(tmp_path / "server.log"),
+    )
+
+
+def test_app_lifespan_warms_default_provider(tmp_path):
+    from api.app import create_app
+
+    app = create_app()
+    api_app_mod = importlib.import_module("api.app")
+    settings = _no_platform_settings(tmp_path)
+    factory = MagicMock()
+
+    with (
+        patch.object(api_app_mod, "get_settings", return_value=settings),
+        patch.object(api_app_mod, "cleanup_provider", new=AsyncMock()),
+        patch.object(api_app_mod, "ProviderFactory", return_value=factory) as cls,
+        TestClient(app),
+    ):
+        pass
+
+    cls.assert_called_once_with(settings)
+    factory.get.assert_called_once_with()
+
+
+def test_app_lifespan_provider_warmup_failure_does_not_block_startup(tmp_path):
+    from fastapi import HTTPException
+
+    from api.app import create_app
+
+    app = create_app()
+    api_app_mod = importlib.import_module("api.app")
+    factory = MagicMock()
+    factory.get.side_effect = HTTPException(status_code=503, detail="no key")
+
+    with (
+        patch.object(
+            api_app_mod, "get_settings", return_value=_no_platform_settings(tmp_path)
+        ),
+        patch.object(api_app_mod, "cleanup_provider", new=AsyncMock()),
+        patch.object(api_app_mod, "ProviderFactory", return_value=factory),
+        TestClient(app) as client,
+    ):
+        assert client.get("/health").status_code == 200
@@ -227,3 +227,78 @@ async def test_cleanup_provider_aclose_raises():
         # Should propagate the error (current behavior - no try/except)
         with pytest.raises(RuntimeError, match="cleanup failed"):
             await cleanup_provider()
+
+
+@pytest.mark.asyncio
+async def test_get_provider_vertex_ai():
+    """provider_type=vertex_ai builds a VertexAIProvider from settings."""
+    from providers.vertex_ai import VertexAIProvider
+
+    settings = _make_mock_settings(
+        provider_type="vertex_ai",
+        vertex_ai_api_key="vertex_key",
+        vertex_ai_base_url="https://vertex.example/v1",
+    )
+    with patch("providers.openai_compat.AsyncOpenAI"):
+        provider = get_provider_factory(settings).get()
+
+    assert isinstance(provider, VertexAIProvider)
+    assert provider.config.base_url == "https://vertex.example/v1"
+    assert provider.config.rate_limit == 40
+
+
+@pytest.mark.asyncio
+async def test_get_provider_vertex_ai_missing_base_url():
+    """Vertex AI without a base URL raises HTTPException 503."""
+    settings = _make_mock_settings(
+        provider_type="vertex_ai",
+        vertex_ai_api_key="vertex_key",
+        vertex_ai_base_url="",
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_provider_factory(settings).get()
+
+    assert exc_info.value.status_code == 503
+    assert "VERTEX_AI_BASE_URL" in exc_info.value.detail
+
+
+def test_get_provider_concurrent_first_requests_build_once():
+    """Concurrent cache misses construct the provider exactly once."""
+    import threading
+
+    settings = _make_mock_settings()
+    built = []
+    barrier = threading.Barrier(8)
+
+    def fake_build(provider_type, _settings):
+        provider = MagicMock()
+        built.append(provider)
+        return provider
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(get_provider_factory(settings).get())
+
+    with patch("api.dependencies._build_provider", side_effect=fake_build):
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert len(built) == 1
+    assert all(p is built[0] for p in results)
+
+
+def test_provider_initialized_logged_once_with_type():
+    """The init log is emitted once per built provider with the type filled in."""
+    settings = _make_mock_settings()
+    with patch("api.dependencies.logger") as mock_logger:
+        factory = get_provider_factory(settings)
+        factory.get()
+        factory.get()
+
+    mock_logger.info.assert_called_once_with("Provider initialized: {}", "nvidia_nim")
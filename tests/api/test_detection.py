@@ -2,14 +2,18 @@
 
 from unittest.mock import patch
 
+import pytest
+
 from api.detection import (
+    has_optimization_marker,
     is_filepath_extraction_request,
     is_prefix_detection_request,
+    is_suggestion_mode_request,
 )
 from api.models.anthropic import Message, MessagesRequest
 
 
-def _make_request(content: str, **kwargs) -> MessagesRequest:
+def _make_request(content: str | list, **kwargs) -> MessagesRequest:
     return MessagesRequest(
         model="claude-3-sonnet",
         max_tokens=100,
@@ -78,3 +82,43 @@ class TestIsFilepathExtractionRequest:
         is_fp, _cmd, out = is_filepath_extraction_request(req)
         assert is_fp is True
         assert "more" not in out
+
+
+class TestHasOptimizationMarker:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "Check QUOTA",
+            "Please write a 5-10 word title for this",
+            "<policy_spec> Command: ls",
+            "[SUGGESTION MODE: next]",
+            "Command: ls\nOutput: a.txt <filepaths>",
+        ],
+    )
+    def test_detector_markers_pass_prefilter(self, content):
+        assert has_optimization_marker(_make_request(content)) is True
+
+    def test_marker_split_across_text_blocks(self):
+        """Adjacent text blocks are joined, as the detectors read them."""
+        req = _make_request(
+            [
+                {"type": "text", "text": "[SUGGESTION "},
+                {"type": "text", "text": "MODE: next]"},
+            ]
+        )
+        assert has_optimization_marker(req) is True
+        assert is_suggestion_mode_request(req) is True
+
+    def test_plain_message_is_filtered_out(self):
+        assert has_optimization_marker(_make_request("hello there")) is False
+
+    def test_assistant_only_marker_is_ignored(self):
+        req = MessagesRequest(
+            model="claude-3-sonnet",
+            max_tokens=100,
+            messages=[
+                Message(role="user", content="hi"),
+                Message(role="assistant", content="quota"),
+            ],
+        )
+        assert has_optimization_marker(req) is False
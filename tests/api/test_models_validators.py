@@ -7,10 +7,8 @@ from config.settings import Settings
 
 
 @pytest.fixture
-def mock_settings():
-    settings = Settings()
-    settings.model = "target-model-from-settings"
-    return settings
+def mock_settings(settings_prototype: Settings) -> Settings:
+    return settings_prototype.model_copy(update={"model": "target-model-from-settings"})
 
 
 def test_messages_request_map_model_claude_to_default(mock_settings):
@@ -73,3 +71,128 @@ def test_messages_request_model_mapping_logs(mock_settings):
         assert "MODEL MAPPING" in args
         assert "claude-2.1" in args
         assert "target-model-from-settings" in args
+
+
+def test_messages_request_native_model_skips_normalization(mock_settings):
+    with (
+        patch("api.models.anthropic.get_settings", return_value=mock_settings),
+        patch("api.models.anthropic.normalize_model_name") as mock_normalize,
+        patch("api.models.anthropic.logger.debug") as mock_log,
+    ):
+        request = MessagesRequest(
+            model="target-model-from-settings",
+            max_tokens=100,
+            messages=[Message(role="user", content="hello")],
+        )
+
+        assert request.model == "target-model-from-settings"
+        assert request.original_model == "target-model-from-settings"
+        mock_normalize.assert_not_called()
+        mock_log.assert_not_called()
+
+
+def test_token_count_request_native_model_skips_normalization(mock_settings):
+    with (
+        patch("api.models.anthropic.get_settings", return_value=mock_settings),
+        patch("api.models.anthropic.normalize_model_name") as mock_normalize,
+    ):
+        request = TokenCountRequest(
+            model="target-model-from-settings",
+            messages=[Message(role="user", content="hello")],
+        )
+
+        assert request.model == "target-model-from-settings"
+        mock_normalize.assert_not_called()
+
+
+def test_message_content_blocks_dispatch_on_type():
+    msg = Message.model_validate(
+        {
+            "role": "assistant",
+            "content": [
+                {"type": "text", "text": None},
+                {"type": "thinking", "thinking": "hmm"},
+                {"type": "tool_use", "id": "t1", "name": "Read", "input": {}},
+            ],
+        }
+    )
+
+    assert isinstance(msg.content, list)
+    assert [type(b).__name__ for b in msg.content] == [
+        "ContentBlockText",
+        "ContentBlockThinking",
+        "ContentBlockToolUse",
+    ]
+    assert msg.content[0].text == ""
+
+
+def test_message_content_unknown_block_type_rejected():
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError, match="union_tag_invalid"):
+        Message.model_validate(
+            {"role": "user", "content": [{"type": "bogus", "text": "x"}]}
+        )
+
+
+def test_metadata_provider_selects_provider_model(mock_settings):
+    mock_settings.lm_studio_model = "local-model"
+    with patch("api.models.anthropic.get_settings", return_value=mock_settings):
+        request = MessagesRequest(
+            model="claude-3-haiku",
+            max_tokens=10,
+            messages=[Message(role="user", content="hello")],
+            metadata={"provider": "lmstudio"},
+        )
+
+        assert request.model == "local-model"
+
+
+@pytest.mark.parametrize("provider", [["lmstudio"], {"name": "lmstudio"}])
+def test_metadata_unhashable_provider_falls_back_to_model(mock_settings, provider):
+    with patch("api.models.anthropic.get_settings", return_value=mock_settings):
+        request = MessagesRequest(
+            model="claude-3-haiku",
+            max_tokens=10,
+            messages=[Message(role="user", content="hello")],
+            metadata={"provider": provider},
+        )
+
+        assert request.model == "target-model-from-settings"
+
+
+def test_tool_schema_json_sorted_and_memoized():
+    from api.models.anthropic import Tool
+
+    tool = Tool(
+        name="Read",
+        input_schema={"type": "object", "properties": {"path": {"type": "string"}}},
+    )
+    first = tool.schema_json
+    assert first == '{"properties":{"path":{"type":"string"}},"type":"object"}'
+    assert tool.schema_json is first
+    assert "schema_json" not in tool.model_dump()
+
+
+def test_tool_schema_json_follows_replaced_schema():
+    from api.models.anthropic import Tool
+
+    tool = Tool(name="Read", input_schema={"type": "object"})
+    assert tool.schema_json == '{"type":"object"}'
+
+    copied = tool.model_copy(update={"input_schema": {"type": "string"}})
+    assert copied.schema_json == '{"type":"string"}'
+    assert tool.schema_json == '{"type":"object"}'
+
+    tool.input_schema = {"type": "integer"}
+    assert tool.schema_json == '{"type":"integer"}'
+
+
+def test_tool_schema_json_handles_big_integers():
+    from api.models.anthropic import Tool
+
+    tool = Tool(
+        name="Pick",
+        input_schema={"type": "integer", "maximum": 2**70},
+    )
+    assert tool.schema_json == f'{{"maximum":{2**70},"type":"integer"}}'
@@ -1,6 +1,8 @@
 """Tests for api/optimization_handlers.py."""
 
-from unittest.mock import patch
+from typing import Any
+
+import pytest
 
 from api.models.anthropic import ContentBlockText, Message, MessagesRequest
 from api.optimization_handlers import (
@@ -11,13 +13,12 @@ from api.optimization_handlers import (
     try_suggestion_skip,
     try_title_skip,
 )
-from config.settings import Settings
 
 
 def _make_request(
     messages_content: str, max_tokens: int | None = None
 ) -> MessagesRequest:
-    """Create a MessagesRequest with a single user message."""
+    """Create a fresh MessagesRequest with a single user message."""
     return MessagesRequest(
         model="claude-3-sonnet",
         max_tokens=max_tokens if max_tokens is not None else 100,
@@ -25,201 +26,153 @@ def _make_request(
     )
 
 
-class TestTryPrefixDetection:
-    def test_disabled_returns_none(self):
-        settings = Settings()
-        settings.fast_prefix_detection = False
-        req = _make_request("x")
-        with patch(
-            "api.optimization_handlers.is_prefix_detection_request",
-            return_value=(True, "/ask"),
-        ):
-            assert try_prefix_detection(req, settings) is None
-
-    def test_enabled_and_match_returns_response(self):
-        settings = Settings()
-        settings.fast_prefix_detection = True
-        req = _make_request("x")
-        with (
-            patch(
-                "api.optimization_handlers.is_prefix_detection_request",
-                return_value=(True, "/ask"),
-            ),
-            patch(
-                "api.optimization_handlers.extract_command_prefix",
-                return_value="/ask",
-            ),
-        ):
-            result = try_prefix_detection(req, settings)
-        assert result is not None
-        block = result.content[0]
-        assert isinstance(block, ContentBlockText)
-        assert block.text == "/ask"
-
-    def test_enabled_but_no_match_returns_none(self):
-        settings = Settings()
-        settings.fast_prefix_detection = True
-        req = _make_request("x")
-        with patch(
-            "api.optimization_handlers.is_prefix_detection_request",
-            return_value=(False, ""),
-        ):
-            assert try_prefix_detection(req, settings) is None
-
-
-class TestTryQuotaMock:
-    def test_disabled_returns_none(self):
-        settings = Settings()
-        settings.enable_network_probe_mock = False
-        req = _make_request("quota", max_tokens=1)
-        with patch(
-            "api.optimization_handlers.is_quota_check_request",
-            return_value=True,
-        ):
-            assert try_quota_mock(req, settings) is None
-
-    def test_enabled_and_match_returns_response(self):
-        settings = Settings()
-        settings.enable_network_probe_mock = True
-        req = _make_request("quota", max_tokens=1)
-        with patch(
-            "api.optimization_handlers.is_quota_check_request",
-            return_value=True,
-        ):
-            result = try_quota_mock(req, settings)
-        assert result is not None
-        block = result.content[0]
-        assert isinstance(block, ContentBlockText)
-        assert "Quota check passed" in block.text
-
-
-class TestTryTitleSkip:
-    def test_disabled_returns_none(self):
-        settings = Settings()
-        settings.enable_title_generation_skip = False
-        req = _make_request("write a 5-10 word title")
-        with patch(
-            "api.optimization_handlers.is_title_generation_request",
-            return_value=True,
-        ):
-            assert try_title_skip(req, settings) is None
-
-    def test_enabled_and_match_returns_response(self):
-        settings = Settings()
-        settings.enable_title_generation_skip = True
-        req = _make_request("x")
-        with patch(
-            "api.optimization_handlers.is_title_generation_request",
-            return_value=True,
-        ):
-            result = try_title_skip(req, settings)
-        assert result is not None
-        block = result.content[0]
-        assert isinstance(block, ContentBlockText)
-        assert block.text == "Conversation"
-
-
-class TestTrySuggestionSkip:
-    def test_disabled_returns_none(self):
-        settings = Settings()
-        settings.enable_suggestion_mode_skip = False
-        req = _make_request("[SUGGESTION MODE: x]")
-        with patch(
-            "api.optimization_handlers.is_suggestion_mode_request",
-            return_value=True,
-        ):
-            assert try_suggestion_skip(req, settings) is None
-
-    def test_enabled_and_match_returns_response(self):
-        settings = Settings()
-        settings.enable_suggestion_mode_skip = True
-        req = _make_request("x")
-        with patch(
-            "api.optimization_handlers.is_suggestion_mode_request",
-            return_value=True,
-        ):
-            result = try_suggestion_skip(req, settings)
-        assert result is not None
-        block = result.content[0]
-        assert isinstance(block, ContentBlockText)
-        assert block.text == ""
-
-
-class TestTryFilepathMock:
-    def test_disabled_returns_none(self):
-        settings = Settings()
-        settings.enable_filepath_extraction_mock = False
-        req = _make_request("Command:\nls\nOutput:\nfilepaths")
-        with patch(
-            "api.optimization_handlers.is_filepath_extraction_request",
-            return_value=(True, "ls", "out"),
-        ):
-            assert try_filepath_mock(req, settings) is None
-
-    def test_enabled_and_match_returns_response(self):
-        settings = Settings()
-        settings.enable_filepath_extraction_mock = True
-        req = _make_request("x")
-        with (
-            patch(
-                "api.optimization_handlers.is_filepath_extraction_request",
-                return_value=(True, "ls", "a.txt b.txt"),
-            ),
-            patch(
-                "api.optimization_handlers.extract_filepaths_from_command",
-                return_value="a.txt\nb.txt",
-            ),
-        ):
-            result = try_filepath_mock(req, settings)
-        assert result is not None
-        block = result.content[0]
-        assert isinstance(block, ContentBlockText)
-        assert block.text == "a.txt\nb.txt"
-
-    def test_extract_filepaths_empty_list_still_returns_response(self):
-        settings = Settings()
-        settings.enable_filepath_extraction_mock = True
-        req = _make_request("x")
-        with (
-            patch(
-                "api.optimization_handlers.is_filepath_extraction_request",
-                return_value=(True, "ls", "out"),
-            ),
-            patch(
-                "api.optimization_handlers.extract_filepaths_from_command",
-                return_value="",
-            ),
-        ):
-            result = try_filepath_mock(req, settings)
-        assert result is not None
-        block = result.content[0]
-        assert isinstance(block, ContentBlockText)
-        assert block.text == ""
+# (settings flag, handler, detection helpers to stub -> return value, reply text)
+HANDLER_CASES = [
+    pytest.param(
+        "fast_prefix_detection",
+        try_prefix_detection,
+        {
+            "is_prefix_detection_request": (True, "/ask"),
+            "extract_command_prefix": "/ask",
+        },
+        "/ask",
+        id="prefix",
+    ),
+    pytest.param(
+        "enable_network_probe_mock",
+        try_quota_mock,
+        {"is_quota_check_request": True},
+        "Quota check passed.",
+        id="quota",
+    ),
+    pytest.param(
+        "enable_title_generation_skip",
+        try_title_skip,
+        {"is_title_generation_request": True},
+        "Conversation",
+        id="title",
+    ),
+    pytest.param(
+        "enable_suggestion_mode_skip",
+        try_suggestion_skip,
+        {"is_suggestion_mode_request": True},
+        "",
+        id="suggestion",
+    ),
+    pytest.param(
+        "enable_filepath_extraction_mock",
+        try_filepath_mock,
+        {
+            "is_filepath_extraction_request": (True, "ls", "a.txt b.txt"),
+            "extract_filepaths_from_command": "a.txt\nb.txt",
+        },
+        "a.txt\nb.txt",
+        id="filepath",
+    ),
+]
+
+
+def _stub_helpers(monkeypatch: pytest.MonkeyPatch, returns: dict[str, Any]) -> None:
+    """Replace detection/extraction helpers with constant-returning stubs."""
+    for name, value in returns.items():
+        monkeypatch.setattr(
+            f"api.optimization_handlers.{name}", lambda *_, _value=value: _value
+        )
+
+
+@pytest.mark.parametrize(("flag", "handler", "returns", "text"), HANDLER_CASES)
+def test_handler_disabled_returns_none(
+    monkeypatch, settings_prototype, flag, handler, returns, text
+):
+    _stub_helpers(monkeypatch, returns)
+    settings = settings_prototype.model_copy(update={flag: False})
+    assert handler(_make_request("x"), settings) is None
+
+
+@pytest.mark.parametrize(("flag", "handler", "returns", "text"), HANDLER_CASES)
+def test_handler_enabled_and_match_returns_response(
+    monkeypatch, settings_prototype, flag, handler, returns, text
+):
+    _stub_helpers(monkeypatch, returns)
+    settings = settings_prototype.model_copy(update={flag: True})
+    result = handler(_make_request("x"), settings)
+    assert result is not None
+    block = result.content[0]
+    assert isinstance(block, ContentBlockText)
+    assert block.text == text
+
+
+def test_prefix_detection_enabled_but_no_match_returns_none(
+    monkeypatch, settings_prototype
+):
+    _stub_helpers(monkeypatch, {"is_prefix_detection_request": (False, "")})
+    settings = settings_prototype.model_copy(update={"fast_prefix_detection": True})
+    assert try_prefix_detection(_make_request("x"), settings) is None
+
+
+def test_filepath_mock_empty_extraction_still_returns_response(
+    monkeypatch, settings_prototype
+):
+    _stub_helpers(
+        monkeypatch,
+        {
+            "is_filepath_extraction_request": (True, "ls", "out"),
+            "extract_filepaths_from_command": "",
+        },
+    )
+    settings = settings_prototype.model_copy(
+        update={"enable_filepath_extraction_mock": True}
+    )
+    result = try_filepath_mock(_make_request("x"), settings)
+    assert result is not None
+    block = result.content[0]
+    assert isinstance(block, ContentBlockText)
+    assert block.text == ""
 
 
 class TestTryOptimizations:
-    def test_first_match_wins(self):
+    def test_first_match_wins(self, monkeypatch, settings_prototype):
         """Quota mock is first in OPTIMIZATION_HANDLERS; it should win over prefix."""
-        settings = Settings()
-        settings.enable_network_probe_mock = True
-        settings.fast_prefix_detection = True
-        req = _make_request("quota", max_tokens=1)
-        with patch(
-            "api.optimization_handlers.is_quota_check_request",
-            return_value=True,
-        ):
-            result = try_optimizations(req, settings)
+        settings = settings_prototype.model_copy(
+            update={
+                "enable_network_probe_mock": True,
+                "fast_prefix_detection": True,
+            }
+        )
+        _stub_helpers(monkeypatch, {"is_quota_check_request": True})
+        result = try_optimizations(_make_request("quota", max_tokens=1), settings)
         assert result is not None
         block = result.content[0]
         assert isinstance(block, ContentBlockText)
         assert "Quota check passed" in block.text
 
-    def test_no_match_returns_none(self):
-        settings = Settings()
-        settings.fast_prefix_detection = False
-        settings.enable_network_probe_mock = False
-        settings.enable_title_generation_skip = False
-        settings.enable_suggestion_mode_skip = False
-        settings.enable_filepath_extraction_mock = False
+    def test_no_match_returns_none(self, settings_prototype):
+        settings = settings_prototype.model_copy(
+            update={
+                "fast_prefix_detection": False,
+                "enable_network_probe_mock": False,
+                "enable_title_generation_skip": False,
+                "enable_suggestion_mode_skip": False,
+                "enable_filepath_extraction_mock": False,
+            }
+        )
         req = _make_request("random user message")
         assert try_optimizations(req, settings) is None
+
+    def test_all_disabled_skips_marker_scan(self, monkeypatch, settings_prototype):
+        def fail_scan(_request):
+            raise AssertionError("prefilter should not scan user text")
+
+        monkeypatch.setattr(
+            "api.optimization_handlers.has_optimization_marker", fail_scan
+        )
+        settings = settings_prototype.model_copy(
+            update={
+                "fast_prefix_detection": False,
+                "enable_network_probe_mock": False,
+                "enable_title_generation_skip": False,
+                "enable_suggestion_mode_skip": False,
+                "enable_filepath_extraction_mock": False,
+            }
+        )
+        assert try_optimizations(_make_request("quota", max_tokens=1), settings) is None
@@ -1,6 +1,7 @@
 """Tests for api/request_utils.py module."""
 
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -10,8 +11,8 @@ from api.detection import (
     is_quota_check_request,
     is_title_generation_request,
 )
-from api.models.anthropic import Message, MessagesRequest
-from api.request_utils import get_token_count
+from api.models.anthropic import Message, MessagesRequest, SystemContent, Tool
+from api.request_utils import get_token_count, get_token_count_validated
 
 
 class TestQuotaCheckRequest:
@@ -440,6 +441,19 @@ class TestGetTokenCount:
         count = get_token_count([msg])
         assert count > 0
 
+    def test_tool_use_input_with_big_integer(self):
+        """Integers beyond 64 bits fall back to the stdlib JSON encoder."""
+        block = MagicMock()
+        block.type = "tool_use"
+        block.name = "calc"
+        block.input = {"x": 2**70}
+        block.id = "tool_1"
+
+        msg = MagicMock()
+        msg.content = [block]
+
+        assert get_token_count([msg]) > 0
+
     def test_multiple_messages_overhead(self):
         """Test that multiple messages include overhead."""
         msg1 = MagicMock()
@@ -510,6 +524,20 @@ class TestGetTokenCount:
         count = get_token_count([msg])
         assert count > 0
 
+    def test_unserializable_unknown_block_falls_back_to_str(self):
+        """Unknown blocks that are not JSON-serializable are counted via str()."""
+        unknown_block = {"type": "custom", "spec": {1, 2, 3}}
+        msg = MagicMock()
+        msg.content = [unknown_block]
+        count = get_token_count([msg])
+        assert count > 4
+
+    def test_tool_result_non_ascii_not_escaped(self):
+        """Non-ASCII JSON content is encoded as-is, not as \\uXXXX escapes."""
+        from api.request_utils import _json_text
+
+        assert _json_text({"text": "héllo"}) == '{"text":"héllo"}'
+
     def test_message_with_image_block(self):
         """Test token count includes image blocks."""
         image_block = MagicMock()
@@ -532,6 +560,22 @@ class TestGetTokenCount:
         count = get_token_count([msg])
         assert count >= 85
 
+    @pytest.mark.parametrize(
+        "source,expected",
+        [
+            ({"base64": "a" * 600_000}, 200),
+            ({"data": b"a" * 600_000}, 200),
+            ({"data": "tiny"}, 85),
+            ({"type": "url", "url": "https://example.com/x.png"}, 765),
+        ],
+        ids=["base64_key", "bytes_data", "min_floor", "no_inline_data"],
+    )
+    def test_image_block_source_variants(self, source, expected):
+        """Image estimate uses data/base64 length, with floor and fallback."""
+        msg = MagicMock()
+        msg.content = [{"type": "image", "source": source}]
+        assert get_token_count([msg]) == expected + 4
+
     def test_known_payload_estimate_range(self):
         """Known payload produces estimate within expected range (validation harness)."""
         import tiktoken
@@ -548,6 +592,240 @@ class TestGetTokenCount:
         count = get_token_count([msg], system=system_text)
         assert count >= expected_min, f"count={count} < expected_min={expected_min}"
 
+    def test_special_token_text_counted_as_ordinary(self):
+        """Text containing special-token markers is encoded without raising."""
+        msg = MagicMock()
+        msg.content = "before <|endoftext|> after"
+        count = get_token_count([msg])
+        assert count > 4
+
+    def test_batch_matches_per_fragment_encoding(self):
+        """Batch encoding sums to the same total as encoding each fragment."""
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        texts = ["System prompt", "First message", "Second message"]
+        msgs = []
+        for text in texts[1:]:
+            msg = MagicMock()
+            msg.content = text
+            msgs.append(msg)
+        expected = sum(len(enc.encode(t)) for t in texts) + 4 + len(msgs) * 4
+        assert get_token_count(msgs, system=texts[0]) == expected
+
+    def test_repeated_system_prompt_served_from_cache(self):
+        """Resending the same system prompt hits the token-length cache."""
+        from api.request_utils import _cached_token_len
+
+        msg = MagicMock()
+        msg.content = "Hi"
+        system = "Repeated system prompt for cache test"
+        first = get_token_count([msg], system=system)
+        hits_before = _cached_token_len.cache_info().hits
+        second = get_token_count([msg], system=system)
+        assert second == first
+        assert _cached_token_len.cache_info().hits >= hits_before + 2
+
+    def test_reordered_tool_schema_shares_cache_entry(self):
+        """Tool schemas that differ only in key order hit the same cache entry."""
+        from api.request_utils import _cached_token_len
+
+        msg = MagicMock()
+        msg.content = "Hi"
+        props = {"path": {"type": "string"}, "limit": {"type": "integer"}}
+        tool_a = MagicMock()
+        tool_a.name = "read_file"
+        tool_a.description = "Read a file"
+        tool_a.input_schema = {"type": "object", "properties": props}
+        tool_b = MagicMock()
+        tool_b.name = "read_file"
+        tool_b.description = "Read a file"
+        tool_b.input_schema = {
+            "properties": dict(reversed(props.items())),
+            "type": "object",
+        }
+        first = get_token_count([msg], tools=[tool_a])
+        hits_before = _cached_token_len.cache_info().hits
+        second = get_token_count([msg], tools=[tool_b])
+        assert second == first
+        assert _cached_token_len.cache_info().hits >= hits_before + 2
+
+    def test_large_fragment_bypasses_cache(self):
+        """Fragments above the cache threshold are not stored in the LRU."""
+        from api.request_utils import _CACHEABLE_TEXT_LEN, _cached_token_len
+
+        msg = MagicMock()
+        msg.content = "word " * (_CACHEABLE_TEXT_LEN // 5 + 1)
+        size_before = _cached_token_len.cache_info().currsize
+        count = get_token_count([msg])
+        assert count > _CACHEABLE_TEXT_LEN // 5
+        assert _cached_token_len.cache_info().currsize == size_before
+
+    def test_cache_pins_bounded_text(self):
+        """Worst-case text held by the token-length cache stays a few MB."""
+        from api.request_utils import _CACHEABLE_TEXT_LEN, _cached_token_len
+
+        maxsize = _cached_token_len.cache_info().maxsize
+        assert maxsize is not None
+        assert maxsize * _CACHEABLE_TEXT_LEN <= 4 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_count_tokens_async_small_request_counted_inline():
+    """Small requests skip the worker-thread hop."""
+    from api.request_utils import count_tokens_async
+
+    msg = Message(role="user", content="hello")
+    with patch("api.request_utils.asyncio.to_thread") as mock_to_thread:
+        count = await count_tokens_async([msg])
+    mock_to_thread.assert_not_called()
+    assert count == get_token_count_validated([msg])
+
+
+@pytest.mark.asyncio
+async def test_count_tokens_async_large_request_offloaded():
+    """Requests above the threshold are counted in a worker thread."""
+    from api.request_utils import count_tokens_async
+
+    msg = Message(role="user", content="word " * 2000)
+    expected = get_token_count_validated([msg])
+    with patch(
+        "api.request_utils.asyncio.to_thread", wraps=asyncio.to_thread
+    ) as mock_to_thread:
+        count = await count_tokens_async([msg])
+    mock_to_thread.assert_called_once()
+    assert count == expected
+
+
+_BIG_TEXT = "word " * 2000
+
+
+@pytest.mark.parametrize(
+    ("messages", "system", "tools"),
+    [
+        pytest.param(
+            [
+                Message(
+                    role="user",
+                    content=[
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": "t1",
+                            "content": _BIG_TEXT,
+                        }
+                    ],
+                )
+            ],
+            None,
+            None,
+            id="tool_result",
+        ),
+        pytest.param(
+            [
+                Message(
+                    role="assistant",
+                    content=[
+                        {
+                            "type": "tool_use",
+                            "id": "t1",
+                            "name": "Write",
+                            "input": {"content": _BIG_TEXT},
+                        }
+                    ],
+                )
+            ],
+            None,
+            None,
+            id="tool_use",
+        ),
+        pytest.param(
+            [Message(role="user", content="hi")],
+            [SystemContent(type="text", text=_BIG_TEXT)],
+            None,
+            id="system_blocks",
+        ),
+        pytest.param(
+            [Message(role="user", content="hi")],
+            None,
+            [Tool(name="t", description=_BIG_TEXT, input_schema={"type": "object"})],
+            id="tools",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_count_tokens_async_large_non_text_payload_offloaded(
+    messages, system, tools
+):
+    """Large tool payloads, system blocks and tool lists also leave the loop."""
+    from api.request_utils import count_tokens_async
+
+    expected = get_token_count_validated(messages, system, tools)
+    with patch(
+        "api.request_utils.asyncio.to_thread", wraps=asyncio.to_thread
+    ) as mock_to_thread:
+        count = await count_tokens_async(messages, system, tools)
+    mock_to_thread.assert_called_once()
+    assert count == expected
+
+
+def test_encoder_shared_across_modules():
+    """Token counting and SSE usage estimation reuse one encoder instance."""
+    from api.request_utils import ENCODER
+    from providers.common import sse_builder
+    from utils.tokens import get_encoder
+
+    assert get_encoder() is ENCODER
+    assert sse_builder.ENCODER is ENCODER
+
+
+def test_validated_count_matches_generic_count():
+    """The attribute-only path gives the same estimate for a validated request."""
+    req = MessagesRequest.model_validate(
+        {
+            "model": "some-model",
+            "max_tokens": 10,
+            "system": [{"type": "text", "text": "System rules"}],
+            "messages": [
+                {"role": "user", "content": "Read the file"},
+                {
+                    "role": "assistant",
+                    "content": [
+                        {"type": "thinking", "thinking": "Plan it"},
+                        {"type": "text", "text": "Reading."},
+                        {
+                            "type": "tool_use",
+                            "id": "tu_1",
+                            "name": "Read",
+                            "input": {"path": "a.py"},
+                        },
+                    ],
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": "tu_1",
+                            "content": [{"type": "text", "text": "print(1)"}],
+                        },
+                        {"type": "image", "source": {"data": "a" * 9000}},
+                    ],
+                },
+            ],
+            "tools": [
+                {
+                    "name": "Read",
+                    "description": "Read a file",
+                    "input_schema": {"type": "object"},
+                }
+            ],
+        }
+    )
+
+    generic = get_token_count(req.messages, req.system, req.tools)
+    validated = get_token_count_validated(req.messages, req.system, req.tools)
+    assert validated == generic > 0
+
 
 # --- Parametrized Edge Case Tests ---
 
@@ -601,6 +879,27 @@ def test_extract_command_prefix_unterminated_quote():
     assert result == "git"
 
 
+@pytest.mark.parametrize(
+    "command",
+    [
+        "git log --oneline",
+        "  DEBUG=1\tpython  script.py\n",
+        "ls -la | grep foo && echo done",
+        "echo \\n back\\slash",
+        "grep pattern\x0bfile",
+        "git commit -m 'quoted message'",
+        'echo "two words"',
+    ],
+)
+def test_split_command_matches_shlex(command):
+    """The quote-free fast path splits exactly like shlex(posix=False)."""
+    import shlex
+
+    from api.command_utils import _split_command
+
+    assert _split_command(command) == shlex.split(command, posix=False)
+
+
 def test_extract_command_prefix_pipe():
     """Piped commands - shlex handles pipe character."""
     result = extract_command_prefix("cat file.txt | grep pattern")
@@ -1,5 +1,8 @@
 """Tests for api/models/responses.py Pydantic response models."""
 
+import pytest
+from pydantic import ValidationError
+
 from api.models.anthropic import (
     ContentBlockText,
     ContentBlockThinking,
@@ -142,16 +145,26 @@ class TestMessagesResponse:
         assert len(resp.content) == 3
 
     def test_with_dict_content(self):
-        """Dict content (unknown block type) should be accepted."""
+        """Dict blocks of a known type are validated into block models."""
         resp = MessagesResponse(
             id="msg_006",
             model="model",
-            content=[{"type": "custom", "data": "value"}],
+            content=[{"type": "text", "text": "value"}],
             usage=Usage(input_tokens=1, output_tokens=1),
         )
         block = resp.content[0]
-        assert isinstance(block, dict)
-        assert block["type"] == "custom"
+        assert isinstance(block, ContentBlockText)
+        assert block.text == "value"
+
+    def test_unknown_block_type_rejected(self):
+        """Unknown block types are rejected instead of passed through as dicts."""
+        with pytest.raises(ValidationError):
+            MessagesResponse(
+                id="msg_006",
+                model="model",
+                content=[{"type": "custom", "data": "value"}],
+                usage=Usage(input_tokens=1, output_tokens=1),
+            )
 
     def test_stop_reason_values(self):
         """All valid stop_reason values should be accepted."""
@@ -14,12 +14,14 @@ def client():
 
 
 @pytest.fixture
-def mock_settings():
-    settings = Settings()
-    settings.fast_prefix_detection = True
-    settings.enable_network_probe_mock = True
-    settings.enable_title_generation_skip = True
-    return settings
+def mock_settings(settings_prototype: Settings) -> Settings:
+    return settings_prototype.model_copy(
+        update={
+            "fast_prefix_detection": True,
+            "enable_network_probe_mock": True,
+            "enable_title_generation_skip": True,
+        }
+    )
 
 
 def test_create_message_fast_prefix_detection(client, mock_settings):
@@ -28,7 +30,7 @@ def test_create_message_fast_prefix_detection(client, mock_settings):
     payload = {
         "model": "claude-3-sonnet",
         "max_tokens": 100,
-        "messages": [{"role": "user", "content": "What is the prefix?"}],
+        "messages": [{"role": "user", "content": "<policy_spec> Command: /ask"}],
     }
 
     with (
@@ -59,11 +61,16 @@ def test_create_message_quota_check_mock(client, mock_settings):
         "messages": [{"role": "user", "content": "quota check"}],
     }
 
-    with patch("api.optimization_handlers.is_quota_check_request", return_value=True):
+    with (
+        patch("api.optimization_handlers.is_quota_check_request", return_value=True),
+        patch("api.routes.count_tokens_async") as mock_count,
+    ):
         response = client.post("/v1/messages", json=payload)
 
     assert response.status_code == 200
     assert "Quota check passed" in response.json()["content"][0]["text"]
+    # Fast-path responses are returned before any tokenization happens.
+    mock_count.assert_not_called()
 
     app.dependency_overrides.clear()
 
@@ -74,7 +81,7 @@ def test_create_message_title_generation_skip(client, mock_settings):
     payload = {
         "model": "claude-3-sonnet",
         "max_tokens": 100,
-        "messages": [{"role": "user", "content": "generate title"}],
+        "messages": [{"role": "user", "content": "Write a 5-10 word title"}],
     }
 
     with patch(
@@ -94,7 +101,7 @@ def test_count_tokens_endpoint(client):
         "messages": [{"role": "user", "content": "hello"}],
     }
 
-    with patch("api.routes.get_token_count", return_value=5):
+    with patch("api.routes.count_tokens_async", return_value=5):
         response = client.post("/v1/messages/count_tokens", json=payload)
 
     assert response.status_code == 200
@@ -102,13 +109,15 @@ def test_count_tokens_endpoint(client):
 
 
 def test_count_tokens_error_returns_500(client):
-    """When get_token_count raises, count_tokens returns 500."""
+    """When token counting raises, count_tokens returns 500."""
     payload = {
         "model": "claude-3-sonnet",
         "messages": [{"role": "user", "content": "hello"}],
     }
 
-    with patch("api.routes.get_token_count", side_effect=RuntimeError("token error")):
+    with patch(
+        "api.routes.count_tokens_async", side_effect=RuntimeError("token error")
+    ):
         response = client.post("/v1/messages/count_tokens", json=payload)
 
     assert response.status_code == 500
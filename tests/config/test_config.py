@@ -53,7 +53,7 @@ class TestSettings:
 
     def test_base_url_constant(self):
         """Test NVIDIA_NIM_BASE_URL is a constant."""
-        from config.settings import NVIDIA_NIM_BASE_URL
+        from providers.nvidia_nim.client import NVIDIA_NIM_BASE_URL
 
         assert NVIDIA_NIM_BASE_URL == "https://integrate.api.nvidia.com/v1"
 
@@ -214,6 +214,31 @@ class TestNimSettingsInvalidBounds:
             NimSettings(reasoning_effort=cast(Any, "invalid"))
 
 
+class TestNimSettingsDefaults:
+    """Test the shared frozen default instance."""
+
+    def test_settings_share_default_instance(self):
+        from config.nim import DEFAULT_NIM_SETTINGS
+        from config.settings import Settings
+
+        assert Settings().nim is DEFAULT_NIM_SETTINGS
+
+    def test_frozen_rejects_mutation(self):
+        from typing import Any, cast
+
+        from config.nim import DEFAULT_NIM_SETTINGS
+
+        with pytest.raises(ValidationError):
+            cast(Any, DEFAULT_NIM_SETTINGS).temperature = 0.5
+
+    def test_model_copy_derives_variant(self):
+        from config.nim import DEFAULT_NIM_SETTINGS
+
+        variant = DEFAULT_NIM_SETTINGS.model_copy(update={"temperature": 0.5})
+        assert variant.temperature == 0.5
+        assert DEFAULT_NIM_SETTINGS.temperature == 1.0
+
+
 class TestNimSettingsValidators:
     """Test custom field validators in NimSettings."""
 
@@ -320,3 +345,35 @@ class TestSettingsOptionalStr:
         monkeypatch.setenv("WHISPER_DEVICE", device)
         s = Settings()
         assert s.whisper_device == device
+
+
+class TestSettingsDefaultModelFor:
+    """Tests for Settings.default_model_for provider model resolution."""
+
+    def test_provider_override_used(self, monkeypatch):
+        from config.settings import Settings
+
+        monkeypatch.setenv("OPENROUTER_MODEL", "openrouter/special")
+        s = Settings()
+        assert s.default_model_for("open_router") == "openrouter/special"
+
+    @pytest.mark.parametrize("provider_type", ["nvidia_nim", "unknown", None])
+    def test_falls_back_to_model(self, monkeypatch, provider_type):
+        from config.settings import Settings
+
+        monkeypatch.setenv("NVIDIA_NIM_MODEL", "")
+        s = Settings()
+        assert s.default_model_for(provider_type) == s.model
+
+    def test_model_copy_and_assignment_not_stale(self, monkeypatch):
+        from config.settings import Settings
+
+        monkeypatch.setenv("NVIDIA_NIM_MODEL", "a/b")
+        s = Settings()
+        assert s.default_model_for("nvidia_nim") == "a/b"
+
+        copied = s.model_copy(update={"nvidia_nim_model": "c/d"})
+        assert copied.default_model_for("nvidia_nim") == "c/d"
+
+        s.nvidia_nim_model = "e/f"
+        assert s.default_model_for("nvidia_nim") == "e/f"
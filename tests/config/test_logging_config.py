@@ -1,8 +1,12 @@
 """Tests for config/logging_config.py."""
 
+import asyncio
 import json
 import logging
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
 
 from config.logging_config import configure_logging
 
@@ -57,3 +61,65 @@ def test_configure_logging_skips_when_already_configured(tmp_path):
     assert "Still goes to first file" in (tmp_path / "test.log").read_text(
         encoding="utf-8"
     )
+
+
+def test_intercept_handler_caches_level_lookup(tmp_path):
+    """Stdlib level names are resolved against loguru once, then cached."""
+    from config import logging_config
+
+    log_file = str(tmp_path / "test.log")
+    configure_logging(log_file, force=True)
+    logging_config._LEVEL_CACHE.clear()
+
+    std_logger = logging.getLogger("test.level_cache")
+    with patch.object(
+        logging_config.logger, "level", wraps=logging_config.logger.level
+    ) as mock_level:
+        std_logger.warning("first")
+        std_logger.warning("second")
+
+    assert mock_level.call_count == 1
+    assert logging_config._LEVEL_CACHE["WARNING"] == "WARNING"
+
+
+def test_log_line_includes_context_and_non_ascii(tmp_path):
+    """JSON lines carry contextualize() keys and keep non-ASCII text readable."""
+    from loguru import logger as loguru_logger
+
+    log_file = str(tmp_path / "test.log")
+    configure_logging(log_file, force=True)
+
+    with loguru_logger.contextualize(request_id="req_123", chat_id=object()):
+        loguru_logger.info("héllo")
+    loguru_logger.complete()
+
+    lines = Path(log_file).read_text(encoding="utf-8").strip().split("\n")
+    record = json.loads(lines[-1])
+    assert record["message"] == "héllo"
+    assert record["request_id"] == "req_123"
+    assert record["chat_id"].startswith("<object object")
+    assert "héllo" in lines[-1]
+
+
+def test_configure_logging_truncates_existing_file(tmp_path):
+    """A fresh start empties the previous server.log."""
+    log_path = tmp_path / "test.log"
+    log_path.write_text("stale line\n", encoding="utf-8")
+    configure_logging(str(log_path), force=True)
+    assert "stale line" not in log_path.read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_truncate_log_periodically_empties_file(tmp_path):
+    """The periodic task truncates the log file in place."""
+    from config.logging_config import _truncate_log_periodically
+
+    log_path = tmp_path / "test.log"
+    log_path.write_text("old content\n", encoding="utf-8")
+    sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+    with (
+        patch("config.logging_config.asyncio.sleep", sleep),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await _truncate_log_periodically(str(log_path), interval_seconds=1)
+    assert log_path.read_text(encoding="utf-8") == ""
@@ -18,6 +18,7 @@ from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 from config.nim import NimSettings
+from config.settings import Settings
 from messaging.base import CLISession, MessagingPlatform, SessionManagerInterface
 from messaging.models import IncomingMessage
 from messaging.session import SessionStore
@@ -25,6 +26,15 @@ from providers.base import ProviderConfig
 from providers.nvidia_nim import NvidiaNimProvider
 
 
+@pytest.fixture(scope="session")
+def settings_prototype() -> Settings:
+    """Settings loaded from the environment once per test session.
+
+    Do not mutate it; derive per-test variants with model_copy(update=...).
+    """
+    return Settings()
+
+
 @pytest.fixture
 def provider_config():
     return ProviderConfig(
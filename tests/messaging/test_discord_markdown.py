@@ -1,5 +1,7 @@
 """Tests for messaging/discord_markdown.py."""
 
+import pytest
+
 from messaging.discord_markdown import (
     _is_gfm_table_header_line,
     _normalize_gfm_tables,
@@ -125,6 +127,12 @@ class TestNormalizeGfmTables:
         assert "para" in result
         assert "| A | B |" in result
 
+    def test_inserted_blank_line_keeps_header_indent(self):
+        text = "para\n  | A | B |\n  |---|---|\n  | 1 | 2 |"
+        assert _normalize_gfm_tables(text) == (
+            "para\n  \n  | A | B |\n  |---|---|\n  | 1 | 2 |"
+        )
+
     def test_table_inside_fence_unchanged(self):
         text = "```\n| A | B |\n|---|\n```"
         result = _normalize_gfm_tables(text)
@@ -137,65 +145,44 @@ class TestRenderMarkdownToDiscord:
     def test_empty_string(self):
         assert render_markdown_to_discord("") == ""
 
-    def test_plain_paragraph(self):
-        assert "hello" in render_markdown_to_discord("hello")
-
-    def test_headings(self):
-        result = render_markdown_to_discord("# Title\n## Sub")
-        assert "Title" in result
-        assert "Sub" in result
-
-    def test_bold_italic(self):
-        result = render_markdown_to_discord("**bold** *italic*")
-        assert "bold" in result
-        assert "italic" in result
-
-    def test_strikethrough(self):
-        result = render_markdown_to_discord("~~strike~~")
-        assert "strike" in result
-
-    def test_inline_code(self):
-        result = render_markdown_to_discord("use `code` here")
-        assert "`" in result
-        assert "code" in result
-
-    def test_code_block(self):
-        result = render_markdown_to_discord("```\nprint(1)\n```")
-        assert "print(1)" in result
-        assert "```" in result
-
-    def test_blockquote(self):
-        result = render_markdown_to_discord("> quote")
-        assert "quote" in result
-
-    def test_bullet_list(self):
-        result = render_markdown_to_discord("- a\n- b")
-        assert "a" in result
-        assert "b" in result
-
-    def test_ordered_list(self):
-        result = render_markdown_to_discord("1. first\n2. second")
-        assert "first" in result
-        assert "second" in result
-
-    def test_link(self):
-        result = render_markdown_to_discord("[text](https://example.com)")
-        assert "text" in result
-        assert "https://example.com" in result
-
-    def test_image_with_alt(self):
-        result = render_markdown_to_discord("![alt](https://img.png)")
-        assert "alt" in result
-        assert "https://img.png" in result
-
-    def test_image_without_alt(self):
-        result = render_markdown_to_discord("![](https://img.png)")
-        assert "https://img.png" in result
-
-    def test_gfm_table(self):
-        text = "| A | B |\n|---|---|\n| 1 | 2 |"
-        result = render_markdown_to_discord(text)
-        assert "A" in result
-        assert "B" in result
-        assert "1" in result
-        assert "2" in result
+    @pytest.mark.parametrize(
+        ("markdown", "expected"),
+        [
+            pytest.param("hello", ["hello"], id="plain_paragraph"),
+            pytest.param("# Title\n## Sub", ["Title", "Sub"], id="headings"),
+            pytest.param("**bold** *italic*", ["bold", "italic"], id="bold_italic"),
+            pytest.param("~~strike~~", ["strike"], id="strikethrough"),
+            pytest.param("use `code` here", ["`", "code"], id="inline_code"),
+            pytest.param("```\nprint(1)\n```", ["print(1)", "```"], id="code_block"),
+            pytest.param("> quote", ["quote"], id="blockquote"),
+            pytest.param("- a\n- b", ["a", "b"], id="bullet_list"),
+            pytest.param("1. first\n2. second", ["first", "second"], id="ordered_list"),
+            pytest.param(
+                "[text](https://example.com)",
+                ["text", "https://example.com"],
+                id="link",
+            ),
+            pytest.param(
+                "![alt](https://img.png)", ["alt", "https://img.png"], id="image_alt"
+            ),
+            pytest.param(
+                "![](https://img.png)", ["https://img.png"], id="image_without_alt"
+            ),
+            pytest.param(
+                "| A | B |\n|---|---|\n| 1 | 2 |",
+                ["A", "B", "1", "2"],
+                id="gfm_table",
+            ),
+        ],
+    )
+    def test_renders_contains(self, markdown, expected):
+        result = render_markdown_to_discord(markdown)
+        for fragment in expected:
+            assert fragment in result
+
+    def test_repeated_input_served_from_cache(self):
+        text = "**cached** render"
+        first = render_markdown_to_discord(text)
+        hits = render_markdown_to_discord.cache_info().hits
+        assert render_markdown_to_discord(text) is first
+        assert render_markdown_to_discord.cache_info().hits == hits + 1
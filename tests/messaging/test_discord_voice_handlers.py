@@ -0,0 +1,83 @@
+"""Tests for voice note handling in the Discord platform."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("discord")
+
+from messaging.platforms.discord import DiscordPlatform
+
+
+def _stub_settings(monkeypatch: pytest.MonkeyPatch, settings: object) -> None:
+    """Make config.settings.get_settings return `settings`."""
+    monkeypatch.setattr("config.settings.get_settings", lambda: settings)
+
+
+class TestDiscordGetAudioAttachment:
+    """Tests for _get_audio_attachment helper."""
+
+    def test_returns_none_when_no_attachments(self):
+        platform = DiscordPlatform(bot_token="token")
+        msg = MagicMock()
+        msg.attachments = []
+        assert platform._get_audio_attachment(msg) is None
+
+    def test_returns_none_when_no_audio_attachments(self):
+        platform = DiscordPlatform(bot_token="token")
+        msg = MagicMock()
+        att = MagicMock()
+        att.content_type = "image/png"
+        att.filename = "pic.png"
+        msg.attachments = [att]
+        assert platform._get_audio_attachment(msg) is None
+
+    def test_returns_attachment_by_content_type(self):
+        platform = DiscordPlatform(bot_token="token")
+        msg = MagicMock()
+        att = MagicMock()
+        att.content_type = "audio/ogg"
+        att.filename = "voice.ogg"
+        msg.attachments = [att]
+        assert platform._get_audio_attachment(msg) is att
+
+    def test_returns_attachment_by_extension(self):
+        platform = DiscordPlatform(bot_token="token")
+        msg = MagicMock()
+        att = MagicMock()
+        att.content_type = "application/octet-stream"
+        att.filename = "voice.ogg"
+        msg.attachments = [att]
+        assert platform._get_audio_attachment(msg) is att
+
+    def test_returns_first_match_with_uppercase_extension(self):
+        platform = DiscordPlatform(bot_token="token")
+        msg = MagicMock()
+        image = MagicMock(content_type="image/png", filename="pic.png")
+        audio = MagicMock(content_type=None, filename="VOICE.M4A")
+        later = MagicMock(content_type="audio/ogg", filename="other.ogg")
+        msg.attachments = [image, audio, later]
+        assert platform._get_audio_attachment(msg) is audio
+
+
+@pytest.mark.asyncio
+async def test_discord_voice_disabled_sends_reply(monkeypatch):
+    """When voice_note_enabled is False, reply with disabled message."""
+    platform = DiscordPlatform(bot_token="token", allowed_channel_ids="123")
+    platform._message_handler = None
+
+    mock_message = MagicMock()
+    mock_message.author.bot = False
+    mock_message.content = None
+    mock_message.channel.id = 123
+    mock_message.reply = AsyncMock()
+
+    mock_att = MagicMock()
+    mock_att.content_type = "audio/ogg"
+    mock_att.filename = "voice.ogg"
+    mock_message.attachments = [mock_att]
+
+    _stub_settings(monkeypatch, MagicMock(voice_note_enabled=False))
+    await platform._on_discord_message(mock_message)
+
+    mock_message.reply.assert_called_once_with("Voice notes are disabled.")
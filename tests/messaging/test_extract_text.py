@@ -4,7 +4,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from utils.text import extract_text_from_content
+from utils.text import extract_text_from_content, iter_text_blocks
 
 
 class TestExtractTextFromContent:
@@ -73,6 +73,38 @@ class TestExtractTextFromContent:
         assert extract_text_from_content([b1, b2]) == "valid"
 
 
+class TestIterTextBlocks:
+    """Tests for utils.text.iter_text_blocks."""
+
+    def test_string_content(self):
+        assert list(iter_text_blocks("hello")) == ["hello"]
+
+    def test_empty_string_yields_nothing(self):
+        assert list(iter_text_blocks("")) == []
+
+    def test_list_skips_empty_and_non_string_text(self):
+        blocks = [
+            _make_block("a"),
+            _make_block(""),
+            _make_block(None),
+            _make_block(123),
+            MagicMock(spec=[]),
+            _make_block("b"),
+        ]
+        assert list(iter_text_blocks(blocks)) == ["a", "b"]
+
+    def test_is_lazy(self):
+        """Blocks after the consumer stops are never read."""
+
+        class _Unreadable:
+            @property
+            def text(self):
+                raise AssertionError("block read after early exit")
+
+        gen = iter_text_blocks([_make_block("first"), _Unreadable()])
+        assert next(gen) == "first"
+
+
 # --- Parametrized Edge Case Tests ---
 
 
@@ -43,6 +43,38 @@ class TestMessagingModels:
         assert msg.is_reply() is True
         assert msg.reply_to_message_id == "100"
 
+    def test_incoming_message_timestamp_is_constructible_and_assignable(self):
+        """timestamp stays a plain datetime field for adapters and callers."""
+        from messaging.models import IncomingMessage
+
+        sent = datetime(2023, 11, 14, 22, 13, 20, 123456, UTC)
+        msg = IncomingMessage(
+            text="Hi",
+            chat_id="1",
+            user_id="2",
+            message_id="3",
+            platform="discord",
+            timestamp=sent,
+        )
+        assert msg.timestamp == sent
+
+        later = sent + timedelta(seconds=5)
+        msg.timestamp = later
+        assert msg.timestamp == later
+
+    def test_incoming_message_uses_slots(self):
+        """IncomingMessage has no per-instance __dict__."""
+        from typing import Any, cast
+
+        from messaging.models import IncomingMessage
+
+        msg = IncomingMessage(
+            text="Hi", chat_id="1", user_id="2", message_id="3", platform="discord"
+        )
+        assert not hasattr(msg, "__dict__")
+        with pytest.raises(AttributeError):
+            cast(Any, msg).unexpected = "x"
+
 
 class TestMessagingBase:
     """Test MessagingPlatform ABC."""
@@ -55,6 +87,43 @@ class TestMessagingBase:
             MessagingPlatform()
 
 
+class TestMessagingPackageExports:
+    """Test lazy package-level re-exports."""
+
+    def test_exports_resolve_to_submodule_objects(self):
+        import messaging
+        from messaging.handler import ClaudeMessageHandler
+        from messaging.trees.data import MessageTree
+
+        assert messaging.ClaudeMessageHandler is ClaudeMessageHandler
+        assert messaging.MessageTree is MessageTree
+        assert set(messaging.__all__) <= set(dir(messaging))
+
+    def test_unknown_attribute_raises(self):
+        import messaging
+
+        with pytest.raises(AttributeError):
+            _ = messaging.NotARealName
+
+    def test_submodule_import_skips_handler(self):
+        """Importing one submodule does not load the handler and renderers."""
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        code = (
+            "import sys, messaging.limiter; print('messaging.handler' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parents[2],
+        )
+        assert result.stdout.strip() == "False"
+
+
 class TestSessionStore:
     """Test SessionStore."""
 
@@ -87,6 +87,34 @@ class TestSessionStoreSaveEdgeCases:
             tmp_store._save()
             # Should not raise
 
+    def test_save_round_trips_tree_with_message_node(self, tmp_path):
+        """Saved trees are indented JSON that loads back unchanged."""
+        from messaging.models import IncomingMessage
+        from messaging.trees.data import MessageNode, MessageTree
+
+        path = str(tmp_path / "sessions.json")
+        store = SessionStore(storage_path=path)
+        incoming = IncomingMessage(
+            text="héllo ✓", chat_id="c1", user_id="u1", message_id="r1", platform="t"
+        )
+        tree = MessageTree(
+            MessageNode(node_id="r1", incoming=incoming, status_message_id="s1")
+        )
+        store.save_tree("r1", tree.to_dict())
+        store._save()
+
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        assert text.startswith('{\n  "trees"')
+        assert json.loads(text)["trees"]["r1"] == tree.to_dict()
+
+        saved = SessionStore(storage_path=path).get_tree("r1")
+        assert saved is not None
+        restored = MessageTree.from_dict(saved)
+        node = restored.get_node("r1")
+        assert node is not None
+        assert node.incoming.text == "héllo ✓"
+
 
 class TestSessionStoreClearAll:
     def test_clear_all_wipes_state_and_persists(self, tmp_path):
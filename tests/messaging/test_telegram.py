@@ -113,3 +113,15 @@ async def test_on_telegram_message_unauthorized(telegram_platform):
     await telegram_platform._on_telegram_message(mock_update, MagicMock())
 
     handler.assert_not_called()
+
+
+def test_compat_module_resolves_names_lazily():
+    """The messaging.telegram shim forwards to messaging.platforms.telegram."""
+    import messaging.platforms.telegram as platform_mod
+    import messaging.telegram as shim
+
+    assert shim.TelegramPlatform is platform_mod.TelegramPlatform
+    assert shim.TelegramError is platform_mod.TelegramError
+    assert "TelegramError" in dir(shim)
+    with pytest.raises(AttributeError):
+        _ = shim.NotARealName
@@ -242,6 +242,29 @@ class TestMessageTreeNavigation:
         tree = _make_tree("root")
         assert tree.find_node_by_status_message("nonexistent") is None
 
+    @pytest.mark.asyncio
+    async def test_active_nodes_tracks_pending_and_in_progress(self):
+        """active_nodes skips terminal nodes, however their state was set."""
+        tree = _make_tree("root")
+        await tree.add_node("c1", _make_incoming(msg_id="c1"), "s1", "root")
+        await tree.add_node("c2", _make_incoming(msg_id="c2"), "s2", "root")
+        await tree.update_state("root", MessageState.COMPLETED)
+        await tree.update_state("c1", MessageState.IN_PROGRESS)
+        c2 = tree.get_node("c2")
+        assert c2 is not None
+        c2.state = MessageState.ERROR
+
+        assert [n.node_id for n in tree.active_nodes()] == ["c1"]
+
+        tree.remove_branch("c1")
+        assert tree.active_nodes() == []
+
+    def test_active_nodes_after_from_dict(self):
+        """Restored trees index their non-terminal nodes."""
+        tree = _make_tree("root")
+        restored = MessageTree.from_dict(tree.to_dict())
+        assert [n.node_id for n in restored.active_nodes()] == ["root"]
+
 
 class TestMessageTreeSerialization:
     """Tests for tree serialization/deserialization."""
@@ -451,6 +474,10 @@ class TestTreeQueueManagerConcurrency:
         assert root.error_message is not None
         assert "restart" in root.error_message
 
+        # The active index is emptied, so a second pass finds nothing.
+        assert tree.active_nodes() == []
+        assert mgr.cleanup_stale_nodes() == 0
+
     @pytest.mark.asyncio
     async def test_mark_node_error_with_propagation(self):
         """mark_node_error should propagate to pending children."""
@@ -466,6 +493,45 @@ class TestTreeQueueManagerConcurrency:
         assert root is not None
         assert root.state == MessageState.ERROR
 
+    @pytest.mark.asyncio
+    async def test_mark_node_error_children_updated_in_one_lock(self):
+        """Pending descendants are marked ERROR with a single bulk update."""
+        from unittest.mock import patch
+
+        mgr = TreeQueueManager()
+        tree = await mgr.create_tree("root", _make_incoming(msg_id="root"), "s_root")
+        _, _ = await mgr.add_to_tree("root", "c1", _make_incoming(msg_id="c1"), "s1")
+        _, _ = await mgr.add_to_tree("c1", "c2", _make_incoming(msg_id="c2"), "s2")
+
+        with patch.object(
+            tree, "update_states_bulk", wraps=tree.update_states_bulk
+        ) as bulk:
+            affected = await mgr.mark_node_error("root", "boom")
+
+        bulk.assert_awaited_once()
+        assert [n.node_id for n in affected] == ["root", "c1", "c2"]
+        for nid in ("c1", "c2"):
+            node = tree.get_node(nid)
+            assert node is not None
+            assert node.state == MessageState.ERROR
+            assert node.error_message == "Parent failed: boom"
+            assert node.completed_at is not None
+
+    @pytest.mark.asyncio
+    async def test_update_states_bulk_shares_completion_time(self):
+        """Bulk updates stamp every node with one timestamp and skip unknown IDs."""
+        tree = _make_tree("root")
+        await tree.add_node("c1", _make_incoming(msg_id="c1"), "s1", "root")
+        await tree.add_node("c2", _make_incoming(msg_id="c2"), "s2", "root")
+
+        updated = await tree.update_states_bulk(
+            ["c1", "missing", "c2"], MessageState.ERROR, error_message="stop"
+        )
+
+        assert [n.node_id for n in updated] == ["c1", "c2"]
+        assert updated[0].completed_at is not None
+        assert updated[0].completed_at == updated[1].completed_at
+
     @pytest.mark.asyncio
     async def test_mark_node_error_nonexistent(self):
         """mark_node_error for nonexistent node returns empty."""
@@ -1,6 +1,6 @@
 import asyncio
 import contextlib
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -94,6 +94,40 @@ async def test_enqueue_and_start_when_free(tree_processor, sample_tree):
         await sample_tree._current_task
 
 
+@pytest.mark.asyncio
+async def test_enqueue_and_start_idle_skips_lock(tree_processor, sample_tree):
+    processor = AsyncMock()
+
+    with patch.object(
+        sample_tree, "with_lock", side_effect=AssertionError("lock taken")
+    ):
+        was_queued = await tree_processor.enqueue_and_start(
+            sample_tree, "msg789", processor
+        )
+        assert was_queued is False
+        assert sample_tree.is_current_node("msg789")
+
+    await sample_tree._current_task
+    processor.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_and_start_waits_for_held_lock(tree_processor, sample_tree):
+    processor = AsyncMock()
+
+    async with sample_tree.with_lock():
+        task = asyncio.create_task(
+            tree_processor.enqueue_and_start(sample_tree, "msg789", processor)
+        )
+        await asyncio.sleep(0)
+        assert not task.done()
+        assert sample_tree.is_processing is False
+
+    assert await task is False
+    await sample_tree._current_task
+    processor.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_enqueue_and_start_when_busy(tree_processor, sample_tree):
     processor = AsyncMock()
@@ -171,6 +205,28 @@ async def test_process_next_triggers_queue_update(sample_tree):
     callback.assert_awaited_once_with(sample_tree)
 
 
+@pytest.mark.asyncio
+async def test_skipped_nodes_coalesce_queue_updates(sample_tree, sample_incoming):
+    callback = AsyncMock()
+    node_started = AsyncMock()
+    processor = TreeQueueProcessor(
+        queue_update_callback=callback, node_started_callback=node_started
+    )
+    root_id = sample_tree.root_id
+    for nid in ("e1", "e2", "ok"):
+        await sample_tree.add_node(nid, sample_incoming, f"s_{nid}", root_id)
+        await sample_tree.enqueue(nid)
+    await sample_tree.update_states_bulk(["e1", "e2"], MessageState.ERROR)
+
+    await processor._process_next(sample_tree, AsyncMock())
+    async with asyncio.timeout(1):
+        while sample_tree.is_processing:
+            await asyncio.sleep(0)
+
+    node_started.assert_awaited_once_with(sample_tree, "ok")
+    callback.assert_awaited_once_with(sample_tree)
+
+
 @pytest.mark.asyncio
 async def test_process_next_triggers_node_started(sample_tree):
     node_started = AsyncMock()
@@ -1,6 +1,7 @@
 """Tests for tree-based message queue system."""
 
 import asyncio
+from typing import Any, cast
 
 import pytest
 
@@ -95,6 +96,16 @@ class TestMessageNode:
         assert node.parent_id == "parent_1"
         assert "child_1" in node.children_ids
 
+    def test_node_uses_slots(self):
+        """MessageNode declares slots; unknown attributes are rejected."""
+        incoming = IncomingMessage(
+            text="Hello", chat_id="1", user_id="1", message_id="m", platform="t"
+        )
+        node = MessageNode(node_id="m", incoming=incoming, status_message_id="s")
+        assert not hasattr(node, "__dict__")
+        with pytest.raises(AttributeError):
+            cast(Any, node).unexpected = 1
+
 
 class TestMessageTree:
     """Test MessageTree class."""
@@ -319,6 +330,31 @@ class TestMessageTree:
         assert tree.get_descendants("grand") == ["grand"]
         assert tree.get_descendants("nonexistent") == []
 
+    @pytest.mark.asyncio
+    async def test_get_descendants_cache_invalidated_on_change(self):
+        """Cached subtrees pick up added nodes and drop removed ones."""
+        root_incoming = IncomingMessage(
+            text="Root", chat_id="1", user_id="1", message_id="root", platform="test"
+        )
+        tree = MessageTree(
+            MessageNode(node_id="root", incoming=root_incoming, status_message_id="s1")
+        )
+        await tree.add_node("child", root_incoming, "s2", "root")
+        assert tree.get_descendants("root") == ["root", "child"]
+        assert tree.get_descendants("child") == ["child"]
+
+        await tree.add_node("grand", root_incoming, "s3", "child")
+        assert tree.get_descendants("root") == ["root", "child", "grand"]
+        assert tree.get_descendants("child") == ["child", "grand"]
+
+        # Callers may mutate the returned list without touching the cache.
+        tree.get_descendants("root").clear()
+        assert tree.get_descendants("root") == ["root", "child", "grand"]
+
+        tree.remove_branch("child")
+        assert tree.get_descendants("root") == ["root"]
+        assert tree.get_descendants("child") == []
+
     @pytest.mark.asyncio
     async def test_remove_branch(self):
         """Test remove_branch removes subtree and updates parent."""
@@ -421,6 +457,36 @@ class TestTreeQueueManager:
         assert node.parent_id == "root"
         assert manager.get_tree_for_node("reply") is tree
 
+    @pytest.mark.asyncio
+    async def test_add_to_tree_does_not_wait_on_manager_lock(self):
+        """Replies only take their own tree's lock, not the manager-wide lock."""
+        manager = TreeQueueManager()
+        root_incoming = IncomingMessage(
+            text="Root", chat_id="1", user_id="1", message_id="root", platform="test"
+        )
+        await manager.create_tree("root", root_incoming, "s1")
+        reply_incoming = IncomingMessage(
+            text="Reply", chat_id="1", user_id="1", message_id="reply", platform="test"
+        )
+
+        async with manager._lock:
+            _, node = await asyncio.wait_for(
+                manager.add_to_tree("root", "reply", reply_incoming, "s2"),
+                timeout=1,
+            )
+
+        assert node.parent_id == "root"
+        assert manager.get_tree_for_node("reply") is manager.get_tree("root")
+
+    @pytest.mark.asyncio
+    async def test_add_to_tree_unknown_parent_raises(self):
+        manager = TreeQueueManager()
+        incoming = IncomingMessage(
+            text="Reply", chat_id="1", user_id="1", message_id="x", platform="test"
+        )
+        with pytest.raises(ValueError, match="not found in any tree"):
+            await manager.add_to_tree("missing", "x", incoming, "s2")
+
     @pytest.mark.asyncio
     async def test_enqueue_and_process(self):
         """Test enqueueing and processing."""
@@ -561,6 +627,29 @@ class TestTreeQueueManager:
         assert sibling_node is not None
         assert sibling_node.state == MessageState.PENDING
 
+    @pytest.mark.asyncio
+    async def test_cancel_branch_removes_queued_nodes_only(self):
+        """Queued branch nodes leave the queue; other queued nodes stay put."""
+        manager = TreeQueueManager()
+        incoming = IncomingMessage(
+            text="Msg", chat_id="1", user_id="1", message_id="root", platform="test"
+        )
+        tree = await manager.create_tree("root", incoming, "s_root")
+        await manager.add_to_tree("root", "a", incoming, "s_a")
+        await manager.add_to_tree("a", "a1", incoming, "s_a1")
+        await manager.add_to_tree("root", "b", incoming, "s_b")
+        async with tree.with_lock():
+            for nid in ("a", "b", "a1"):
+                tree.put_queue_unlocked(nid)
+
+        cancelled = await manager.cancel_branch("a")
+
+        assert {n.node_id for n in cancelled} == {"a", "a1"}
+        assert await tree.get_queue_snapshot() == ["b"]
+        for node in cancelled:
+            assert node.error_message == "Cancelled by user"
+            assert node.completed_at is not None
+
     @pytest.mark.asyncio
     async def test_remove_branch_non_root(self):
         """Test remove_branch removes only the subtree when branch is not root."""
@@ -580,6 +669,7 @@ class TestTreeQueueManager:
             reply_to_message_id="root",
         )
         tree, _ = await manager.add_to_tree("root", "child", child_incoming, "s2")
+        manager.register_node("s2", "root")
 
         removed, root_id, removed_entire = await manager.remove_branch("child")
 
@@ -591,6 +681,8 @@ class TestTreeQueueManager:
         assert manager.get_tree("root") is not None
         assert tree.get_node("child") is None
         assert "child" not in tree.get_root().children_ids
+        assert manager.get_tree_for_node("s2") is None
+        assert manager.resolve_parent_node_id("s2") is None
 
     @pytest.mark.asyncio
     async def test_remove_branch_root_removes_tree(self):
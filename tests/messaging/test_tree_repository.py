@@ -1,3 +1,4 @@
+import sys
 from unittest.mock import MagicMock
 
 import pytest
@@ -46,6 +47,26 @@ def test_register_node(repository, sample_tree):
     assert repository.has_node("child_id")
 
 
+def test_register_node_unknown_root_is_ignored(repository):
+    repository.register_node("child_id", "missing_root")
+
+    assert not repository.has_node("child_id")
+    assert repository.get_tree_for_node("child_id") is None
+
+
+def test_from_dict_maps_nodes_to_tree_objects(repository, sample_tree):
+    repository.add_tree("root_id", sample_tree)
+    repository.register_node("s1", "root_id")
+    data = repository.to_dict()
+    data["node_to_tree"]["stale"] = "gone"
+
+    new_repo = TreeRepository.from_dict(data)
+    tree = new_repo.get_tree("root_id")
+    assert new_repo.get_tree_for_node("s1") is tree
+    assert not new_repo.has_node("stale")
+    assert new_repo.to_dict()["node_to_tree"] == {"root_id": "root_id", "s1": "root_id"}
+
+
 def test_get_node(repository, sample_tree):
     repository.add_tree("root_id", sample_tree)
     node = repository.get_node("root_id")
@@ -93,6 +114,16 @@ def test_resolve_parent_node_id(repository, sample_tree):
     assert repository.resolve_parent_node_id("unknown") is None
 
 
+def test_remove_tree_unregisters_status_messages(repository, sample_tree):
+    repository.add_tree("root_id", sample_tree)
+    repository.register_node("s1", "root_id")
+
+    assert repository.remove_tree("root_id") is sample_tree
+    assert not repository.has_node("root_id")
+    assert not repository.has_node("s1")
+    assert repository.resolve_parent_node_id("s1") is None
+
+
 def test_get_pending_children(repository, sample_tree):
     repository.add_tree("root_id", sample_tree)
 
@@ -121,6 +152,30 @@ def test_get_pending_children(repository, sample_tree):
     assert pending[0].node_id == "child_id"
 
 
+def test_get_pending_children_deep_chain(repository, sample_tree):
+    repository.add_tree("root_id", sample_tree)
+    parent_id = "root_id"
+    depth = sys.getrecursionlimit() + 100
+    for i in range(depth):
+        node_id = f"n{i}"
+        incoming = IncomingMessage(
+            text="x", chat_id="c1", user_id="u1", message_id=node_id, platform="t"
+        )
+        sample_tree._nodes[node_id] = MessageNode(
+            node_id=node_id,
+            incoming=incoming,
+            status_message_id=f"s_{node_id}",
+            parent_id=parent_id,
+        )
+        sample_tree._nodes[parent_id].children_ids.append(node_id)
+        parent_id = node_id
+
+    pending = repository.get_pending_children("root_id")
+    assert len(pending) == depth
+    assert pending[0].node_id == "n0"
+    assert pending[-1].node_id == f"n{depth - 1}"
+
+
 def test_to_from_dict(repository, sample_tree):
     repository.add_tree("root_id", sample_tree)
     data = repository.to_dict()
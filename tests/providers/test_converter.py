@@ -8,6 +8,8 @@ from providers.common.message_converter import AnthropicToOpenAIConverter
 
 
 class MockMessage:
+    __slots__ = ("content", "role")
+
     def __init__(self, role, content):
         self.role = role
         self.content = content
@@ -24,6 +26,8 @@ class MockBlock:
 
 
 class MockTool:
+    __slots__ = ("description", "input_schema", "name")
+
     def __init__(self, name, description, input_schema):
         self.name = name
         self.description = description
@@ -281,6 +285,30 @@ def test_get_block_attr_defaults():
     assert get_block_attr(object(), "missing", "default") == "default"
 
 
+def test_get_block_attr_dict_subclass_and_none_values():
+    from providers.common.message_converter import get_block_attr
+
+    class Payload(dict):
+        text = "from attribute"
+
+    assert get_block_attr(Payload(text="from key"), "text") == "from attribute"
+    assert get_block_attr(Payload(id="x"), "id") == "x"
+    assert get_block_attr(MockBlock(type="text", text=None), "text", "d") is None
+    assert get_block_attr({"text": None}, "text", "d") is None
+
+
+def test_tool_result_list_content_mixed_items():
+    content = [
+        MockBlock(
+            type="tool_result",
+            tool_use_id="t1",
+            content=[{"type": "text", "text": "a"}, {"type": "image"}, 3],
+        )
+    ]
+    result = AnthropicToOpenAIConverter.convert_messages([MockMessage("user", content)])
+    assert result[0]["content"] == "a\n{'type': 'image'}\n3"
+
+
 def test_input_not_dict():
     # Tool input might not be a dict (e.g. malformed or string)
     content = [MockBlock(type="tool_use", id="call_x", name="f", input="some_string")]
@@ -100,6 +100,17 @@ class TestMapError:
         result = map_error(exc)
         assert result is exc
 
+    def test_subclass_uses_most_specific_mapping(self):
+        """Subclasses resolve through the MRO like the isinstance chain did."""
+
+        class CustomBadRequest(openai.BadRequestError):
+            pass
+
+        exc = _make_openai_error(CustomBadRequest, status_code=400)
+        assert isinstance(map_error(exc), InvalidRequestError)
+        # Second lookup is served from the per-type cache.
+        assert isinstance(map_error(exc), InvalidRequestError)
+
     @pytest.mark.parametrize(
         "exc_cls,expected_cls",
         [
@@ -70,6 +70,8 @@ async def _collect_stream(provider, request):
 
 
 class MockMessage:
+    __slots__ = ("content", "role")
+
     def __init__(self, role, content):
         self.role = role
         self.content = content
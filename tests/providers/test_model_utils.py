@@ -131,3 +131,19 @@ def test_is_claude_model_parametrized(model, expected):
 def test_normalize_model_name_parametrized(model, default, expected):
     """Parametrized model normalization."""
     assert normalize_model_name(model, default) == expected
+
+
+def test_normalize_model_name_is_memoized():
+    from providers.model_utils import _normalize_cached
+
+    normalize_model_name("claude-memo-test", "memo-default")
+    hits_before = _normalize_cached.cache_info().hits
+    assert normalize_model_name("claude-memo-test", "memo-default") == "memo-default"
+    assert _normalize_cached.cache_info().hits == hits_before + 1
+
+
+def test_normalize_model_name_env_default_not_cached_stale(monkeypatch):
+    monkeypatch.setenv("MODEL", "first-env-model")
+    assert normalize_model_name("claude-3-opus") == "first-env-model"
+    monkeypatch.setenv("MODEL", "second-env-model")
+    assert normalize_model_name("claude-3-opus") == "second-env-model"
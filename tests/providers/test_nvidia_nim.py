@@ -8,12 +8,16 @@ from providers.nvidia_nim import NvidiaNimProvider
 
 # Mock data classes
 class MockMessage:
+    __slots__ = ("content", "role")
+
     def __init__(self, role, content):
         self.role = role
         self.content = content
 
 
 class MockTool:
+    __slots__ = ("description", "input_schema", "name")
+
     def __init__(self, name, description, input_schema):
         self.name = name
         self.description = description
@@ -64,6 +68,36 @@ async def test_init(provider_config):
         mock_openai.assert_called_once()
 
 
+def test_provider_instances_have_no_dict(nim_provider):
+    """Built-in providers are fully slotted."""
+    assert not hasattr(nim_provider, "__dict__")
+
+
+def test_init_defaults_base_url():
+    """Without a configured base_url the public NIM endpoint is used."""
+    from config.nim import NimSettings
+    from providers.base import ProviderConfig
+    from providers.nvidia_nim.client import NVIDIA_NIM_BASE_URL
+
+    with patch("providers.openai_compat.AsyncOpenAI"):
+        provider = NvidiaNimProvider(
+            ProviderConfig(api_key="test_key"), nim_settings=NimSettings()
+        )
+    assert provider._base_url == NVIDIA_NIM_BASE_URL
+
+
+def test_init_without_any_base_url_raises():
+    """Providers with no default endpoint reject a config without base_url."""
+    from providers.base import ProviderConfig
+    from providers.vertex_ai import VertexAIProvider
+
+    with (
+        patch("providers.openai_compat.AsyncOpenAI"),
+        pytest.raises(ValueError, match="requires a base_url"),
+    ):
+        VertexAIProvider(ProviderConfig(api_key="test_key"))
+
+
 @pytest.mark.asyncio
 async def test_init_uses_configurable_timeouts():
     """Test that provider passes configurable read/write/connect timeouts to client."""
@@ -1,11 +1,13 @@
 """Tests for providers/nvidia_nim/request.py."""
 
-from unittest.mock import MagicMock
+from dataclasses import dataclass, field
+from typing import Any
 
 from config.nim import NimSettings
 from providers.nvidia_nim.request import (
     _set_extra,
     _set_if_not_none,
+    _static_params,
     build_request_body,
 )
 
@@ -44,58 +46,94 @@ class TestSetExtra:
         assert extra["top_k"] == 10
 
 
+@dataclass(slots=True)
+class FakeMessage:
+    role: str = "user"
+    content: Any = "hi"
+
+
+@dataclass(slots=True)
+class FakeRequest:
+    """Plain stand-in for MessagesRequest; unset optional fields read as None."""
+
+    model: str = "test"
+    messages: list[FakeMessage] = field(default_factory=lambda: [FakeMessage()])
+    max_tokens: int | None = 100
+    system: Any = None
+    temperature: float | None = None
+    top_p: float | None = None
+    stop_sequences: list[str] | None = None
+    tools: list | None = None
+    tool_choice: dict | None = None
+    extra_body: dict | None = None
+    top_k: int | None = None
+
+
 class TestBuildRequestBody:
     def test_max_tokens_capped_by_nim(self):
         """Request max_tokens exceeds nim.max_tokens -> capped."""
-        req = MagicMock()
-        req.model = "test"
-        req.messages = [MagicMock(role="user", content="hi")]
-        req.max_tokens = 100000
-        req.system = None
-        req.temperature = None
-        req.top_p = None
-        req.stop_sequences = None
-        req.tools = None
-        req.tool_choice = None
-        req.extra_body = None
-        req.top_k = None
+        req = FakeRequest(max_tokens=100000)
 
         nim = NimSettings(max_tokens=4096)
         body = build_request_body(req, nim)
         assert body["max_tokens"] == 4096
 
     def test_presence_penalty_included_when_nonzero(self):
-        req = MagicMock()
-        req.model = "test"
-        req.messages = [MagicMock(role="user", content="hi")]
-        req.max_tokens = 100
-        req.system = None
-        req.temperature = None
-        req.top_p = None
-        req.stop_sequences = None
-        req.tools = None
-        req.tool_choice = None
-        req.extra_body = None
-        req.top_k = None
+        req = FakeRequest()
 
         nim = NimSettings(presence_penalty=0.5)
         body = build_request_body(req, nim)
         assert body["presence_penalty"] == 0.5
 
     def test_parallel_tool_calls_included(self):
-        req = MagicMock()
-        req.model = "test"
-        req.messages = [MagicMock(role="user", content="hi")]
-        req.max_tokens = 100
-        req.system = None
-        req.temperature = None
-        req.top_p = None
-        req.stop_sequences = None
-        req.tools = None
-        req.tool_choice = None
-        req.extra_body = None
-        req.top_k = None
+        req = FakeRequest()
 
         nim = NimSettings(parallel_tool_calls=False)
         body = build_request_body(req, nim)
         assert body["parallel_tool_calls"] is False
+
+    def test_settings_extras_shared_but_request_extra_wins(self):
+        """Settings-derived params are cached; request extra_body still overrides."""
+        req = FakeRequest(extra_body={"min_p": 0.5})
+
+        nim = NimSettings(min_p=0.1, seed=7)
+        first = build_request_body(req, nim)
+        req.extra_body = None
+        second = build_request_body(req, nim)
+
+        assert first["extra_body"]["min_p"] == 0.5
+        assert second["extra_body"]["min_p"] == 0.1
+        assert first["seed"] == second["seed"] == 7
+        assert first["extra_body"] is not second["extra_body"]
+        assert _static_params(nim) is _static_params(nim)
+
+    def test_request_extra_overrides_thinking_defaults(self):
+        """Request extra_body replaces thinking defaults without altering them."""
+        req = FakeRequest(
+            extra_body={"thinking": {"type": "disabled"}, "reasoning_split": False}
+        )
+
+        nim = NimSettings()
+        overridden = build_request_body(req, nim)
+        req.extra_body = None
+        default = build_request_body(req, nim)
+
+        assert overridden["extra_body"]["thinking"] == {"type": "disabled"}
+        assert overridden["extra_body"]["reasoning_split"] is False
+        assert default["extra_body"]["thinking"] == {"type": "enabled"}
+        assert default["extra_body"]["reasoning_split"] is True
+        assert default["extra_body"]["chat_template_kwargs"]["clear_thinking"] is False
+
+    def test_duck_typed_request_missing_optional_fields(self):
+        """Requests without optional attributes fall back to settings defaults."""
+
+        class MinimalRequest:
+            def __init__(self):
+                self.model = "test"
+                self.messages = [FakeMessage()]
+
+        body = build_request_body(MinimalRequest(), NimSettings())
+        assert body["model"] == "test"
+        assert body["max_tokens"] == NimSettings().max_tokens
+        assert "tools" not in body
+        assert "stop" not in body
@@ -5,12 +5,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from api.models.anthropic import ThinkingConfig
 from providers.base import ProviderConfig
 from providers.open_router import OpenRouterProvider
 from providers.open_router.request import OPENROUTER_DEFAULT_MAX_TOKENS
 
 
 class MockMessage:
+    __slots__ = ("content", "role")
+
     def __init__(self, role, content):
         self.role = role
         self.content = content
@@ -105,6 +108,41 @@ def test_build_request_body_has_reasoning_extra(open_router_provider):
     assert body["extra_body"]["reasoning"]["enabled"] is True
 
 
+@pytest.mark.parametrize(
+    ("thinking", "expect_reasoning"),
+    [
+        (None, True),
+        (ThinkingConfig(), True),
+        (ThinkingConfig(type="enabled"), True),
+        (ThinkingConfig(enabled=False), False),
+    ],
+)
+def test_build_request_body_thinking_flag(
+    open_router_provider, thinking, expect_reasoning
+):
+    """Reasoning is requested unless thinking is explicitly disabled."""
+    req = MockRequest(thinking=thinking)
+    body = open_router_provider._build_request_body(req)
+    assert ("reasoning" in body.get("extra_body", {})) is expect_reasoning
+
+
+def test_build_request_body_extra_body_copied_only_when_extended(
+    open_router_provider,
+):
+    """Request extra_body is never mutated; it is reused when nothing is added."""
+    extra = {"transforms": ["middle-out"]}
+
+    body = open_router_provider._build_request_body(MockRequest(extra_body=extra))
+    assert body["extra_body"] == {
+        "transforms": ["middle-out"],
+        "reasoning": {"enabled": True},
+    }
+    assert extra == {"transforms": ["middle-out"]}
+
+    disabled = MockRequest(extra_body=extra, thinking=ThinkingConfig(enabled=False))
+    assert open_router_provider._build_request_body(disabled)["extra_body"] is extra
+
+
 def test_build_request_body_base_url_and_model(open_router_provider):
     """Base URL and model are correct in provider config."""
     assert open_router_provider._base_url == "https://openrouter.ai/api/v1"
@@ -300,6 +338,30 @@ async def test_stream_response_reasoning_details(open_router_provider):
         assert any("Step 1" in e for e in events)
 
 
+def test_handle_extra_reasoning_joins_details(open_router_provider):
+    """Text items are merged into one thinking delta; others are skipped."""
+    sse = MagicMock()
+    sse.ensure_thinking_block.return_value = iter(())
+    sse.emit_thinking_delta.side_effect = lambda text: text
+    delta = MagicMock(
+        reasoning_details=[{"text": "a"}, {"text": ""}, "junk", {"text": "b"}]
+    )
+
+    events = list(open_router_provider._handle_extra_reasoning(delta, sse))
+
+    assert events == ["ab"]
+    sse.ensure_thinking_block.assert_called_once()
+
+
+def test_handle_extra_reasoning_without_text(open_router_provider):
+    """No thinking block is opened when no item carries text."""
+    sse = MagicMock()
+    delta = MagicMock(reasoning_details=[{"type": "summary"}, None])
+
+    assert list(open_router_provider._handle_extra_reasoning(delta, sse)) == []
+    sse.ensure_thinking_block.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_stream_response_error_path(open_router_provider):
     """Stream raises exception -> error event emitted."""
@@ -6,6 +6,39 @@ import pytest_asyncio
 
 from providers.rate_limit import GlobalRateLimiter
 
+_real_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """Integer-nanosecond clock that only moves when a sleep advances it."""
+
+    __slots__ = ("now_ns",)
+
+    def __init__(self) -> None:
+        self.now_ns = 0
+
+    def __call__(self) -> int:
+        return self.now_ns
+
+    @property
+    def seconds(self) -> float:
+        return self.now_ns / 1e9
+
+    async def sleep(self, delay: float) -> None:
+        # Yield first so concurrent sleepers all start from the same "now",
+        # then jump to this sleeper's deadline.
+        wake_ns = self.now_ns + round(delay * 1e9)
+        await _real_sleep(0)
+        self.now_ns = max(self.now_ns, wake_ns)
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Drive limiter waits from a fake clock instead of wall time."""
+    clock = FakeClock()
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    return clock
+
 
 class TestProviderRateLimiter:
     """Tests for providers.rate_limit.GlobalRateLimiter."""
@@ -18,66 +51,32 @@ class TestProviderRateLimiter:
         GlobalRateLimiter.reset_instance()
 
     @pytest.mark.asyncio
-    async def test_proactive_throttling(self):
-        """
-        Test proactive throttling.
-        Logic ported from verify_provider_limiter.py
-        """
-        # Re-init with tight limits: 1 request per 0.25 second
-        GlobalRateLimiter.reset_instance()
-        limiter = GlobalRateLimiter.get_instance(rate_limit=1, rate_window=0.25)
-
-        start_time = time.time()
+    async def test_proactive_throttling(self, fake_clock):
+        """One request per 0.25s: five requests are granted 0.25s apart."""
+        limiter = GlobalRateLimiter(rate_limit=1, rate_window=0.25, clock=fake_clock)
 
-        async def call_limiter():
+        granted = []
+        for _ in range(5):
             await limiter.wait_if_blocked()
-            return time.time()
+            granted.append(fake_clock.seconds)
 
-        # 5 requests.
-        # R0 -> 0s
-        # R1 -> 0.25s
-        # R2 -> 0.50s
-        # R3 -> 0.75s
-        # R4 -> 1.00s
-        results = [await call_limiter() for _ in range(5)]
-
-        total_time = time.time() - start_time
-
-        assert len(results) == 5
-        # Should take at least ~1.0s
-        assert total_time >= 0.9, f"Throttling failed, took too fast: {total_time:.2f}s"
+        assert granted == pytest.approx([0.0, 0.25, 0.5, 0.75, 1.0])
 
     @pytest.mark.asyncio
-    async def test_reactive_blocking(self):
-        """
-        Test reactive blocking when set_blocked is called.
-        Logic ported from verify_provider_limiter.py
-        """
-        GlobalRateLimiter.reset_instance()
-        limiter = GlobalRateLimiter.get_instance()
-
-        start_time = time.time()
-
-        # Manually block for 1.5s
-        block_time = 1.5
-        limiter.set_blocked(block_time)
-
+    async def test_reactive_blocking(self, fake_clock):
+        """Concurrent callers both wait out a reactive block."""
+        limiter = GlobalRateLimiter(clock=fake_clock)
+        limiter.set_blocked(1.5)
         assert limiter.is_blocked()
 
-        async def call_limiter():
-            return await limiter.wait_if_blocked()
-
-        # Run 2 calls concurrently
-        # They should both wait for the block time
-        results = await asyncio.gather(call_limiter(), call_limiter())
-
-        total_time = time.time() - start_time
+        results = await asyncio.gather(
+            limiter.wait_if_blocked(), limiter.wait_if_blocked()
+        )
 
         # Both should report having waited reactively
-        assert all(results) is True
-        assert total_time >= block_time - 0.1, (
-            f"Reactive block failed, took {total_time:.2f}s"
-        )
+        assert results == [True, True]
+        assert fake_clock.seconds >= 1.5
+        assert limiter.is_blocked() is False
 
     @pytest.mark.asyncio
     async def test_set_blocked_zero_immediately_unblocks(self):
@@ -97,17 +96,14 @@ class TestProviderRateLimiter:
         assert limiter.remaining_wait() == 0
 
     @pytest.mark.asyncio
-    async def test_remaining_wait_decreases(self):
+    async def test_remaining_wait_decreases(self, fake_clock):
         """remaining_wait() should decrease over time."""
-        limiter = GlobalRateLimiter.get_instance(rate_limit=100, rate_window=60)
+        limiter = GlobalRateLimiter(rate_limit=100, rate_window=60, clock=fake_clock)
         limiter.set_blocked(2.0)
-
-        wait1 = limiter.remaining_wait()
-        assert wait1 > 1.5
+        assert limiter.remaining_wait() == 2.0
 
         await asyncio.sleep(0.5)
-        wait2 = limiter.remaining_wait()
-        assert wait2 < wait1
+        assert limiter.remaining_wait() == 1.5
 
     @pytest.mark.asyncio
     async def test_is_blocked_false_initially(self):
@@ -152,23 +148,35 @@ class TestProviderRateLimiter:
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_proactive_strict_rolling_window(self):
+    async def test_free_slot_waits_while_lock_held(self):
+        """The lock-free fast path is skipped while another task holds the lock."""
+        limiter = GlobalRateLimiter.get_instance(rate_limit=100, rate_window=60)
+
+        await limiter._lock.acquire()
+        task = asyncio.create_task(limiter.wait_if_blocked())
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        limiter._lock.release()
+        assert await asyncio.wait_for(task, timeout=1) is False
+
+    @pytest.mark.asyncio
+    async def test_proactive_strict_rolling_window(self, fake_clock):
         """
         Proactive limiter should enforce a strict rolling window:
-        for any i, t[i+rate_limit] - t[i] >= rate_window (within tolerance).
+        for any i, t[i+rate_limit] - t[i] >= rate_window.
         """
-        GlobalRateLimiter.reset_instance()
         rate_limit = 2
         rate_window = 0.5
-        limiter = GlobalRateLimiter.get_instance(
-            rate_limit=rate_limit, rate_window=rate_window
+        limiter = GlobalRateLimiter(
+            rate_limit=rate_limit, rate_window=rate_window, clock=fake_clock
         )
 
-        acquired: list[float] = []
+        acquired: list[int] = []
 
         async def acquire():
             await limiter.wait_if_blocked()
-            acquired.append(time.monotonic())
+            acquired.append(fake_clock.now_ns)
 
         # Trigger concurrency; without strict rolling windows, this can burst.
         await asyncio.gather(*(acquire() for _ in range(5)))
@@ -176,11 +184,11 @@ class TestProviderRateLimiter:
         acquired.sort()
         assert len(acquired) == 5
 
-        tolerance = 0.05
+        window_ns = round(rate_window * 1e9)
         for i in range(len(acquired) - rate_limit):
-            assert acquired[i + rate_limit] - acquired[i] >= rate_window - tolerance, (
+            assert acquired[i + rate_limit] - acquired[i] >= window_ns, (
                 f"Rolling window violated at i={i}: "
-                f"dt={acquired[i + rate_limit] - acquired[i]:.3f}s"
+                f"dt={acquired[i + rate_limit] - acquired[i]}ns"
             )
 
     @pytest.mark.asyncio
@@ -65,6 +65,27 @@ class TestContentBlockManager:
         assert mgr.text_started is False
         assert mgr.tool_indices == {}
 
+    def test_buffer_task_args_parses_once_complete(self):
+        mgr = ContentBlockManager()
+        assert mgr.buffer_task_args(0, '{"prompt": "hi"') is None
+        assert mgr.buffer_task_args(0, "}") == {
+            "prompt": "hi",
+            "run_in_background": False,
+        }
+
+    def test_buffer_task_args_unwraps_double_encoded_json(self):
+        mgr = ContentBlockManager()
+        encoded = json.dumps(json.dumps({"prompt": "hi"}))
+        assert mgr.buffer_task_args(0, encoded) == {
+            "prompt": "hi",
+            "run_in_background": False,
+        }
+
+    def test_buffer_task_args_non_object_keeps_buffering(self):
+        mgr = ContentBlockManager()
+        assert mgr.buffer_task_args(0, "[1, 2]") is None
+        assert mgr.flush_task_arg_buffers() == [(0, "{}")]
+
 
 class TestSSEBuilderMessageLifecycle:
     """Tests for message_start, message_delta, message_stop, done."""
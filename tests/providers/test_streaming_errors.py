@@ -530,3 +530,42 @@ class TestStreamChunkEdgeCases:
         event_text = "".join(events1 + events2 + flushed)
         assert "tool_use" in event_text
         assert "{}" in event_text
+
+    @pytest.mark.asyncio
+    async def test_tool_call_delta_without_function(self):
+        """A tool-call delta with function=None does not abort the stream."""
+        provider = _make_provider()
+        request = _make_request()
+
+        id_only = MagicMock(index=0, id="call_1", function=None)
+        named = MagicMock(index=0, id=None)
+        named.function.name = "search"
+        named.function.arguments = '{"q": "x"}'
+        stream_mock = AsyncStreamMock(
+            [
+                _make_chunk(tool_calls=[id_only]),
+                _make_chunk(tool_calls=[named]),
+                _make_chunk(finish_reason="tool_calls"),
+            ]
+        )
+
+        with (
+            patch.object(
+                provider._client.chat.completions,
+                "create",
+                new_callable=AsyncMock,
+                return_value=stream_mock,
+            ),
+            patch.object(
+                provider._global_rate_limiter,
+                "wait_if_blocked",
+                new_callable=AsyncMock,
+                return_value=False,
+            ),
+        ):
+            events = await _collect_stream(provider, request)
+
+        event_text = "".join(events)
+        assert '"type": "error"' not in event_text
+        assert "call_1" in event_text
+        assert '\\"q\\": \\"x\\"' in event_text
@@ -1,16 +1,13 @@
 import json
 from unittest.mock import MagicMock
 
-import pytest
-
 from config.nim import NimSettings
 from providers.base import ProviderConfig
 from providers.common import ContentBlockManager
 from providers.nvidia_nim import NvidiaNimProvider
 
 
-@pytest.mark.asyncio
-async def test_task_tool_interception():
+def test_task_tool_interception(monkeypatch):
     # Setup provider
     config = ProviderConfig(api_key="test")
     provider = NvidiaNimProvider(config, nim_settings=NimSettings())
@@ -22,6 +19,17 @@ async def test_task_tool_interception():
     sse = MagicMock()
     sse.blocks = ContentBlockManager()
 
+    # Capture the patched args dict before it is serialized for emission.
+    parsed_args = []
+    buffer_task_args = sse.blocks.buffer_task_args
+
+    def spy_buffer_task_args(index, args):
+        parsed = buffer_task_args(index, args)
+        parsed_args.append(parsed)
+        return parsed
+
+    monkeypatch.setattr(sse.blocks, "buffer_task_args", spy_buffer_task_args)
+
     # Tool call data (Task tool)
     tc = {
         "index": 0,
@@ -41,14 +49,11 @@ async def test_task_tool_interception():
     # Call the method (consume generator to trigger side effects)
     list(provider._process_tool_call(tc, sse))
 
-    # Find the emit_tool_delta call and check args
-    calls = sse.emit_tool_delta.call_args_list
-    assert len(calls) > 0
-    args_passed = json.loads(calls[0][0][1])
-    assert args_passed["run_in_background"] is False
-
-
-if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(test_task_tool_interception())
+    sse.emit_tool_delta.assert_called_once()
+    assert parsed_args == [
+        {
+            "description": "test task",
+            "prompt": "do something",
+            "run_in_background": False,
+        }
+    ]
@@ -1,17 +1,40 @@
 """Shared text extraction utilities."""
 
+import json
+from collections.abc import Iterator
 from typing import Any
 
+import orjson
 
-def extract_text_from_content(content: Any) -> str:
-    """Extract concatenated text from message content (str or list of content blocks)."""
+
+def iter_text_blocks(content: Any) -> Iterator[str]:
+    """Yield the non-empty text strings in message content (str or list of blocks)."""
     if isinstance(content, str):
-        return content
-    if isinstance(content, list):
-        parts = []
+        if content:
+            yield content
+    elif isinstance(content, list):
         for block in content:
             text = getattr(block, "text", "")
             if text and isinstance(text, str):
-                parts.append(text)
-        return "".join(parts)
-    return ""
+                yield text
+
+
+def extract_text_from_content(content: Any) -> str:
+    """Extract concatenated text from message content (str or list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(iter_text_blocks(content))
+
+
+def sorted_json_text(value: Any) -> str:
+    """Serialize a JSON-compatible value to compact text with sorted keys.
+
+    orjson handles the common case; values it rejects, such as integers
+    beyond 64 bits, fall back to the stdlib encoder.
+    """
+    try:
+        return orjson.dumps(
+            value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+        ).decode()
+    except TypeError:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
@@ -0,0 +1,16 @@
+"""Shared tiktoken encoder access."""
+
+from functools import lru_cache
+
+import tiktoken
+
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=4)
+def get_encoder(name: str = DEFAULT_ENCODING) -> tiktoken.Encoding:
+    """Return the process-wide encoder for `name`, loading it on first use.
+
+    Encoding objects are thread-safe, so every caller shares one instance.
+    """
+    return tiktoken.get_encoding(name)